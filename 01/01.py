@@ -6,15 +6,97 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import heapq
 import pathlib
+from typing import BinaryIO, Iterable, Iterator, List
+
+import numpy as np
+import numpy.typing as npt
+
+
+gMaximumNumberOfDigits = 18
+gIsValidCharacter = np.zeros(256, dtype=np.bool_)
+gIsValidCharacter[list(b"0123456789 \t\r\n")] = True
 
 
 def Main() -> None:
-  input = pathlib.Path(__file__).with_name("input.txt").read_text()
-  elves = [[int(calories) for calories in elf.splitlines()] for elf in input.split("\n\n")]
-  elfSums = sorted((sum(elf) for elf in elves), reverse=True)
-  print("Solution of part 1: {}".format(max(elfSums)))
-  print("Solution of part 2: {}".format(sum(elfSums[:3])))
+  with open(pathlib.Path(__file__).with_name("input.txt"), "rb") as inputFile:
+    topElfSums = FindTopElfSums(ReadChunks(inputFile), 3)
+
+  print("Solution of part 1: {}".format(topElfSums[0]))
+  print("Solution of part 2: {}".format(sum(topElfSums)))
+
+
+def ReadChunks(file: BinaryIO, chunkSize: int = 1 << 20) -> Iterator[bytes]:
+  return iter(lambda: file.read(chunkSize), b"")
+
+
+def FindTopElfSums(chunks: Iterable[bytes], numberOfElves: int) -> List[int]:
+  topElfSums: List[int] = []
+  if numberOfElves <= 0: return topElfSums
+
+  for elfSums in ComputeElfSumsOfChunks(chunks):
+    if elfSums.size > numberOfElves: elfSums = elfSums[np.argpartition(elfSums, -numberOfElves)[-numberOfElves:]]
+
+    for elfSum in elfSums.tolist():
+      if len(topElfSums) < numberOfElves:
+        heapq.heappush(topElfSums, elfSum)
+      elif elfSum > topElfSums[0]:
+        heapq.heapreplace(topElfSums, elfSum)
+
+  return sorted(topElfSums, reverse=True)
+
+
+def ComputeElfSumsOfChunks(chunks: Iterable[bytes]) -> Iterator[npt.NDArray[np.int64]]:
+  remainder = b""
+
+  for chunk in chunks:
+    buffer = remainder + chunk
+    endOfLastElf = max(buffer.rfind(b"\n\n"), buffer.rfind(b"\n\r\n"))
+
+    if endOfLastElf < 0:
+      remainder = buffer
+    else:
+      yield ComputeElfSums(buffer[:endOfLastElf + 1])
+      remainder = buffer[endOfLastElf + 1:]
+
+  if len(remainder.strip()) > 0: yield ComputeElfSums(remainder)
+
+
+def ComputeElfSums(buffer: bytes) -> npt.NDArray[np.int64]:
+  characters = np.frombuffer(buffer, dtype=np.uint8)
+  isValid = gIsValidCharacter[characters]
+
+  if not np.all(isValid):
+    invalidPosition = int(np.argmin(isValid))
+    raise RuntimeError(f"Unexpected character {buffer[invalidPosition:invalidPosition + 1]!r} in inventory.")
+
+  isDigit = np.zeros(characters.size + 2, dtype=np.bool_)
+  np.greater_equal(characters, ord("0"), out=isDigit[1:-1])
+  digitRunBounds = np.flatnonzero(isDigit[1:] != isDigit[:-1])
+  numberStarts = digitRunBounds[0::2]
+  numberLengths = digitRunBounds[1::2] - numberStarts
+  if numberStarts.size == 0: return np.zeros(0, dtype=np.int64)
+  maximumNumberOfDigits = int(numberLengths.max())
+
+  if maximumNumberOfDigits > gMaximumNumberOfDigits:
+    raise RuntimeError(f"Number with {maximumNumberOfDigits} digits is too large.")
+
+  numbers = np.zeros(numberStarts.size, dtype=np.int64)
+
+  for digitIndex in range(maximumNumberOfDigits):
+    hasDigit = numberLengths > digitIndex
+    numbers[hasDigit] = 10 * numbers[hasDigit] + (characters[numberStarts[hasDigit] + digitIndex] - ord("0"))
+
+  numberLineIndices = np.searchsorted(np.flatnonzero(characters == ord("\n")), numberStarts)
+  lineIndexSteps = np.diff(numberLineIndices)
+
+  if np.any(lineIndexSteps == 0):
+    raise RuntimeError("Line contains more than one number.")
+
+  elfStarts = np.concatenate(([0], np.flatnonzero(lineIndexSteps > 1) + 1))
+  elfSums: npt.NDArray[np.int64] = np.add.reduceat(numbers, elfStarts)
+  return elfSums
 
 
 if __name__ == "__main__": Main()
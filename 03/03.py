@@ -7,25 +7,27 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import pathlib
-from typing import Collection, Iterable, Iterator, List, Optional, Set
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+import numpy.typing as npt
 
 
 def Main() -> None:
-  input = pathlib.Path(__file__).with_name("input.txt").read_text()
-  rucksacks = input.splitlines()
-  print("Solution of part 1: {}".format(sum(GetItemPriority(GetMisplacedItem(rucksack)) for rucksack in rucksacks)))
-  print("Solution of part 2: {}".format(sum(GetItemPriority(GetBadge(group)) for group in GetGroups(rucksacks))))
+  input = pathlib.Path(__file__).with_name("input.txt").read_bytes()
+  firstCompartmentMasks, secondCompartmentMasks = ComputeCompartmentMasks(input)
+  rucksackMasks = firstCompartmentMasks | secondCompartmentMasks
+  print("Solution of part 1: {}".format(ConvertMasksToPriorities(firstCompartmentMasks & secondCompartmentMasks).sum()))
+  print("Solution of part 2: {}".format(ConvertMasksToPriorities(ComputeGroupMasks(rucksackMasks, 3)).sum()))
 
 
-def GetMisplacedItem(rucksack: str) -> str:
-  firstCompartment = rucksack[:len(rucksack) // 2]
-  secondCompartment = rucksack[len(rucksack) // 2:]
-  intersection = set(firstCompartment).intersection(secondCompartment)
-  return GetOnlyItem(intersection)
+def GetMisplacedItemPriority(rucksack: str) -> int:
+  firstCompartmentMask = ConvertItemsToMask(rucksack[:len(rucksack) // 2])
+  secondCompartmentMask = ConvertItemsToMask(rucksack[len(rucksack) // 2:])
+  return GetOnlyItemPriority(firstCompartmentMask & secondCompartmentMask)
 
 
-def GetGroups(rucksacks: Iterable[str]) -> Iterator[List[str]]:
-  groupSize = 3
+def GetGroups(rucksacks: Iterable[str], groupSize: int = 3) -> Iterator[List[str]]:
   group = []
 
   for rucksack in rucksacks:
@@ -38,19 +40,27 @@ def GetGroups(rucksacks: Iterable[str]) -> Iterator[List[str]]:
   if len(group) > 0: yield group
 
 
-def GetBadge(rucksacks: Iterable[str]) -> str:
-  intersection: Optional[Set[str]] = None
+def GetBadgePriority(rucksacks: Iterable[str]) -> int:
+  intersection = -1
 
   for rucksack in rucksacks:
-    intersection = set(rucksack) if intersection is None else intersection.intersection(rucksack)
+    intersection &= ConvertItemsToMask(rucksack)
+
+  return GetOnlyItemPriority(intersection)
+
+
+def ConvertItemsToMask(items: str) -> int:
+  mask = 0
 
-  assert intersection is not None
-  return GetOnlyItem(intersection)
+  for item in items:
+    mask |= 1 << (GetItemPriority(item) - 1)
 
+  return mask
 
-def GetOnlyItem(collection: Collection[str]) -> str:
-  assert len(collection) == 1
-  return next(item for item in collection)
+
+def GetOnlyItemPriority(mask: int) -> int:
+  assert (mask > 0) and (mask & (mask - 1) == 0)
+  return mask.bit_length()
 
 
 def GetItemPriority(item: str) -> int:
@@ -58,4 +68,33 @@ def GetItemPriority(item: str) -> int:
   return itemAsInt - 38 if itemAsInt < 97 else itemAsInt - 96
 
 
+def ComputeCompartmentMasks(buffer: bytes) -> Tuple[npt.NDArray[np.uint64], npt.NDArray[np.uint64]]:
+  characters = np.frombuffer(buffer.rstrip() + b"\n", dtype=np.uint8)
+  isNewline = characters == ord("\n")
+  priorities = np.where(characters < ord("a"), characters.astype(np.int64) - 38, characters.astype(np.int64) - 96)
+  itemMasks = np.where(isNewline, np.uint64(0), np.left_shift(np.uint64(1), (priorities - 1).astype(np.uint64)))
+  lineEnds = np.flatnonzero(isNewline)
+  lineStarts = np.concatenate(([0], lineEnds[:-1] + 1))
+  compartmentStarts = np.stack((lineStarts, (lineStarts + lineEnds) // 2), axis=1).reshape(-1)
+  compartmentMasks = np.bitwise_or.reduceat(itemMasks, compartmentStarts)
+  return compartmentMasks[0::2], compartmentMasks[1::2]
+
+
+def ComputeGroupMasks(rucksackMasks: npt.NDArray[np.uint64], groupSize: int) -> npt.NDArray[np.uint64]:
+  numberOfFullGroups = rucksackMasks.size // groupSize
+  groupMasks: npt.NDArray[np.uint64] = np.bitwise_and.reduce(rucksackMasks[:numberOfFullGroups * groupSize].reshape(
+    -1, groupSize),
+                                                             axis=1)
+
+  if rucksackMasks.size > numberOfFullGroups * groupSize:
+    groupMasks = np.append(groupMasks, np.bitwise_and.reduce(rucksackMasks[numberOfFullGroups * groupSize:]))
+
+  return groupMasks
+
+
+def ConvertMasksToPriorities(masks: npt.NDArray[np.uint64]) -> npt.NDArray[np.int64]:
+  assert np.all((masks != 0) & ((masks & (masks - np.uint64(1))) == 0))
+  return np.frexp(masks.astype(np.float64))[1].astype(np.int64)
+
+
 if __name__ == "__main__": Main()
@@ -7,33 +7,59 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import pathlib
-from typing import List, Tuple
 
+import numpy as np
+import numpy.typing as npt
 
-def Main() -> None:
-  input = pathlib.Path(__file__).with_name("input.txt").read_text()
-  assignmentPairs = [ParseAssignmentPair(line) for line in input.splitlines()]
-  print("Solution of part 1: {}".format(
-    sum(AreAssignmentsContainedInEachOther(assignment1, assignment2) for assignment1, assignment2 in assignmentPairs)))
-  print("Solution of part 2: {}".format(
-    sum(DoAssignmentsOverlap(assignment1, assignment2) for assignment1, assignment2 in assignmentPairs)))
 
+class VAssignmentIndex(object):
+  def __init__(self, assignments: npt.NDArray[np.int64]) -> None:
+    self.assignments = assignments.reshape(-1, 2)
+    self.sortedStarts = np.sort(self.assignments[:, 0])
+    self.sortedEnds = np.sort(self.assignments[:, 1])
+
+  def CountAssignmentsCoveringSections(self, sections: npt.ArrayLike) -> npt.NDArray[np.int64]:
+    counts: npt.NDArray[np.int64] = (np.searchsorted(self.sortedStarts, sections, side="right") -
+                                     np.searchsorted(self.sortedEnds, sections, side="left"))
+    return counts
+
+  def CountAssignmentsOverlappingRanges(self, starts: npt.ArrayLike, ends: npt.ArrayLike) -> npt.NDArray[np.int64]:
+    counts: npt.NDArray[np.int64] = (np.searchsorted(self.sortedStarts, ends, side="right") -
+                                     np.searchsorted(self.sortedEnds, starts, side="left"))
+    return counts
+
+  def FindAssignmentsOverlappingOthers(self) -> npt.NDArray[np.bool_]:
+    return self.CountAssignmentsOverlappingRanges(self.assignments[:, 0], self.assignments[:, 1]) >= 2
 
-gAssignment = Tuple[int, int]
+  def ComputeMaximumCoverage(self) -> int:
+    if self.assignments.shape[0] == 0: return 0
+    positions = np.concatenate((self.assignments[:, 0], self.assignments[:, 1] + 1))
+    deltas = np.repeat(np.array([1, -1], dtype=np.int64), self.assignments.shape[0])
+    return int(np.cumsum(deltas[np.lexsort((deltas, positions))]).max())
+
+
+def Main() -> None:
+  input = pathlib.Path(__file__).with_name("input.txt").read_text()
+  assignmentPairs = ParseAssignmentPairs(input)
+  print("Solution of part 1: {}".format(AreAssignmentsContainedInEachOther(assignmentPairs).sum()))
+  print("Solution of part 2: {}".format(DoAssignmentsOverlap(assignmentPairs).sum()))
 
 
-def ParseAssignmentPair(string: str) -> List[gAssignment]:
-  assignmentsParts = [assignmentString.split("-") for assignmentString in string.split(",")]
-  return [(int(assignmentParts[0]), int(assignmentParts[1])) for assignmentParts in assignmentsParts]
+def ParseAssignmentPairs(string: str) -> npt.NDArray[np.int64]:
+  if len(string.strip()) == 0: return np.zeros((0, 4), dtype=np.int64)
+  return np.fromstring(string.replace("-", " ").replace(",", " "), dtype=np.int64, sep=" ").reshape(-1, 4)
 
 
-def AreAssignmentsContainedInEachOther(assignment1: gAssignment, assignment2: gAssignment) -> bool:
-  return (((assignment1[0] <= assignment2[0]) and (assignment1[1] >= assignment2[1]))
-          or (assignment2[0] <= assignment1[0]) and (assignment2[1] >= assignment1[1]))
+def AreAssignmentsContainedInEachOther(assignmentPairs: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+  start1, end1, start2, end2 = assignmentPairs.T
+  areContained: npt.NDArray[np.bool_] = ((start1 <= start2) & (end1 >= end2)) | ((start2 <= start1) & (end2 >= end1))
+  return areContained
 
 
-def DoAssignmentsOverlap(assignment1: gAssignment, assignment2: gAssignment) -> bool:
-  return (assignment1[0] <= assignment2[0] <= assignment1[1]) or (assignment2[0] <= assignment1[0] <= assignment2[1])
+def DoAssignmentsOverlap(assignmentPairs: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+  start1, end1, start2, end2 = assignmentPairs.T
+  doOverlap: npt.NDArray[np.bool_] = (start1 <= end2) & (start2 <= end1)
+  return doOverlap
 
 
 if __name__ == "__main__": Main()
@@ -6,24 +6,17 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-import copy
 import pathlib
 import re
-from typing import List, Tuple
+from typing import Iterable, List, Sequence, Tuple
 
 
 def Main() -> None:
   input = pathlib.Path(__file__).with_name("input.txt").read_text()
   board, moves = ParseInput(input)
-  boardWithCrateMover9000 = copy.deepcopy(board)
-  boardWithCrateMover9001 = copy.deepcopy(board)
-
-  for move in moves:
-    PerformMoveWithCrateMover9000(move, boardWithCrateMover9000)
-    PerformMoveWithCrateMover9001(move, boardWithCrateMover9001)
-
-  print("Solution of part 1: {}".format("".join(stack[-1] for stack in boardWithCrateMover9000)))
-  print("Solution of part 2: {}".format("".join(stack[-1] for stack in boardWithCrateMover9001)))
+  topSlots = [(stackIndex, -1) for stackIndex in range(len(board))]
+  print("Solution of part 1: {}".format("".join(FindCrates(board, moves, topSlots, False))))
+  print("Solution of part 2: {}".format("".join(FindCrates(board, moves, topSlots, True))))
 
 
 def ParseInput(input: str) -> Tuple[List[List[str]], List[Tuple[int, int, int]]]:
@@ -33,26 +26,90 @@ def ParseInput(input: str) -> Tuple[List[List[str]], List[Tuple[int, int, int]]]
   boardLines.pop()
   board: List[List[str]] = [[] for _ in range(numberOfStacks)]
 
-  for line in boardLines:
-    for stackIndex in range(numberOfStacks):
-      characterIndex = 4 * stackIndex + 1
-      if characterIndex >= len(line): break
-      crate = line[characterIndex]
-      if crate != " ": board[stackIndex].insert(0, crate)
+  for line in reversed(boardLines):
+    for stack, crate in zip(board, line[1::4]):
+      if crate != " ": stack.append(crate)
 
-  movesMatches = [re.findall(r"^move ([0-9]+) from ([0-9]+) to ([0-9]+)$", line) for line in movesString.splitlines()]
-  moves = [(int(match[0]), int(match[1]) - 1, int(match[2]) - 1) for match, in movesMatches]
+  moves = [(int(match[0]), int(match[1]) - 1, int(match[2]) - 1)
+           for match in re.findall(r"^move ([0-9]+) from ([0-9]+) to ([0-9]+)$", movesString, flags=re.MULTILINE)]
   return board, moves
 
 
+def PerformMoves(board: Sequence[Sequence[str]], moves: Iterable[Tuple[int, int, int]],
+                 keepsOrder: bool) -> List[List[str]]:
+  newBoard = [list(stack) for stack in board]
+  PerformMove = PerformMoveWithCrateMover9001 if keepsOrder else PerformMoveWithCrateMover9000
+
+  for move in moves:
+    PerformMove(move, newBoard)
+
+  return newBoard
+
+
+def ComputeFinalHeights(board: Sequence[Sequence[str]], moves: Iterable[Tuple[int, int, int]]) -> List[int]:
+  heights = [len(stack) for stack in board]
+
+  for numberOfCrates, sourceStackIndex, targetStackIndex in moves:
+    if numberOfCrates > heights[sourceStackIndex]:
+      raise RuntimeError(f"Stack {sourceStackIndex + 1} has fewer than {numberOfCrates} crates.")
+
+    heights[sourceStackIndex] -= numberOfCrates
+    heights[targetStackIndex] += numberOfCrates
+
+  return heights
+
+
+def FindCrates(board: Sequence[Sequence[str]], moves: Sequence[Tuple[int, int, int]], slots: Iterable[Tuple[int, int]],
+               keepsOrder: bool) -> List[str]:
+  heights = ComputeFinalHeights(board, moves)
+  currentSlots = []
+
+  for stackIndex, position in slots:
+    if position < 0: position += heights[stackIndex]
+
+    if not 0 <= position < heights[stackIndex]:
+      raise RuntimeError(f"Stack {stackIndex + 1} has no crate at position {position}.")
+
+    currentSlots.append((stackIndex, position))
+
+  for numberOfCrates, sourceStackIndex, targetStackIndex in reversed(moves):
+    heights[targetStackIndex] -= numberOfCrates
+    heights[sourceStackIndex] += numberOfCrates
+
+    for slotIndex, (stackIndex, position) in enumerate(currentSlots):
+      if (stackIndex == targetStackIndex) and (position >= heights[targetStackIndex]):
+        offset = position - heights[targetStackIndex]
+
+        if keepsOrder:
+          currentSlots[slotIndex] = (sourceStackIndex, heights[sourceStackIndex] - numberOfCrates + offset)
+        else:
+          currentSlots[slotIndex] = (sourceStackIndex, heights[sourceStackIndex] - 1 - offset)
+
+  return [board[stackIndex][position] for stackIndex, position in currentSlots]
+
+
 def PerformMoveWithCrateMover9000(move: Tuple[int, int, int], board: List[List[str]]) -> None:
-  for _ in range(move[0]):
-    board[move[2]].append(board[move[1]].pop())
+  sourceStack = board[move[1]]
+
+  if move[0] > len(sourceStack):
+    raise RuntimeError(f"Stack {move[1] + 1} has fewer than {move[0]} crates.")
+
+  if move[1] == move[2]: return
+  sourceIndex = len(sourceStack) - move[0]
+  board[move[2]].extend(reversed(sourceStack[sourceIndex:]))
+  del sourceStack[sourceIndex:]
 
 
 def PerformMoveWithCrateMover9001(move: Tuple[int, int, int], board: List[List[str]]) -> None:
-  board[move[2]].extend(board[move[1]][-move[0]:])
-  del board[move[1]][-move[0]:]
+  sourceStack = board[move[1]]
+
+  if move[0] > len(sourceStack):
+    raise RuntimeError(f"Stack {move[1] + 1} has fewer than {move[0]} crates.")
+
+  if move[1] == move[2]: return
+  sourceIndex = len(sourceStack) - move[0]
+  board[move[2]].extend(sourceStack[sourceIndex:])
+  del sourceStack[sourceIndex:]
 
 
 if __name__ == "__main__": Main()
@@ -7,16 +7,40 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import pathlib
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Sequence
 
 
 def Main() -> None:
-  signal = pathlib.Path(__file__).with_name("input.txt").read_text()
-  print("Solution of part 1: {}".format(FindStartOfPacket(signal, 4)))
-  print("Solution of part 2: {}".format(FindStartOfPacket(signal, 14)))
+  with open(pathlib.Path(__file__).with_name("input.txt"), "rb") as signalFile:
+    startsOfPackets = FindStartsOfPackets(ReadChunks(signalFile), [4, 14])
 
+  print("Solution of part 1: {}".format(startsOfPackets[0]))
+  print("Solution of part 2: {}".format(startsOfPackets[1]))
 
-def FindStartOfPacket(signal: str, length: int) -> int:
-  return next(index for index in range(length, len(signal)) if len(set(signal[index - length:index])) == length)
+
+def ReadChunks(file: BinaryIO, chunkSize: int = 1 << 20) -> Iterator[bytes]:
+  return iter(lambda: file.read(chunkSize), b"")
+
+
+def FindStartsOfPackets(chunks: Iterable[bytes], lengths: Sequence[int]) -> List[Optional[int]]:
+  startsOfPackets: List[Optional[int]] = [None for _ in lengths]
+  remainingLengthIndices = sorted(range(len(lengths)), key=lambda lengthIndex: lengths[lengthIndex], reverse=True)
+  lastIndices = 256 * [-1]
+  windowStart = 0
+  index = 0
+
+  for chunk in chunks:
+    for byte in chunk:
+      if lastIndices[byte] >= windowStart: windowStart = lastIndices[byte] + 1
+      lastIndices[byte] = index
+      index += 1
+
+      while (len(remainingLengthIndices) > 0) and (lengths[remainingLengthIndices[-1]] <= index - windowStart):
+        startsOfPackets[remainingLengthIndices.pop()] = index
+
+      if len(remainingLengthIndices) == 0: return startsOfPackets
+
+  return startsOfPackets
 
 
 if __name__ == "__main__": Main()
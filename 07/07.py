@@ -7,7 +7,7 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import pathlib
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 class VDirectory(object):
@@ -17,28 +17,170 @@ class VDirectory(object):
     self.subDirectories: Dict[str, VDirectory] = {}
 
   def GetAllTransitiveSubDirectories(self) -> Dict["VDirectory", int]:
-    selfSize = sum(fileSize for fileSize in self.files.values())
     result: Dict[VDirectory, int] = {}
+    directories = [self]
 
-    for subDirectory in self.subDirectories.values():
-      subSubDirectories = subDirectory.GetAllTransitiveSubDirectories()
-      selfSize += subSubDirectories[subDirectory]
-      result.update(subSubDirectories)
+    for directory in directories:
+      directories.extend(directory.subDirectories.values())
+
+    for directory in reversed(directories):
+      subDirectoriesSize = sum(result[subDirectory] for subDirectory in directory.subDirectories.values())
+      result[directory] = sum(directory.files.values()) + subDirectoriesSize
+
+    return result
+
+
+class VSizeMultiset(object):
+  def __init__(self) -> None:
+    self.numberOfBits = 0
+    self.counts: Dict[Tuple[int, int], int] = {}
+    self.sums: Dict[Tuple[int, int], int] = {}
+    self.totalCount = 0
+    self.totalSum = 0
+
+  def Add(self, size: int, count: int = 1) -> None:
+    while size >> self.numberOfBits != 0:
+      self.numberOfBits += 1
+      self.counts[(self.numberOfBits, 0)] = self.totalCount
+      self.sums[(self.numberOfBits, 0)] = self.totalSum
+
+    for level in range(self.numberOfBits + 1):
+      node = (level, size >> level)
+      self.counts[node] = self.counts.get(node, 0) + count
+      self.sums[node] = self.sums.get(node, 0) + count * size
+
+      if self.counts[node] == 0:
+        del self.counts[node]
+        del self.sums[node]
+
+    self.totalCount += count
+    self.totalSum += count * size
+
+  def Remove(self, size: int) -> None:
+    assert self.counts.get((0, size), 0) > 0
+    self.Add(size, -1)
+
+  def GetSumOfSizesAtMost(self, size: int) -> int:
+    if size < 0: return 0
+    if size >> self.numberOfBits != 0: return self.totalSum
+    result = self.sums.get((0, size), 0)
+
+    for level in range(self.numberOfBits):
+      if (size >> level) & 1: result += self.sums.get((level, (size >> level) ^ 1), 0)
 
-    result[self] = selfSize
     return result
 
+  def FindSmallestSizeAtLeast(self, size: int) -> Optional[int]:
+    size = max(size, 0)
+    if size >> self.numberOfBits != 0: return None
+    if (0, size) in self.counts: return size
+
+    for level in range(self.numberOfBits):
+      prefix = (size >> level) | 1
+
+      if ((size >> level) & 1 == 0) and ((level, prefix) in self.counts):
+        while level > 0:
+          level -= 1
+          prefix <<= 1
+          if (level, prefix) not in self.counts: prefix |= 1
+
+        return prefix
+
+    return None
+
+
+class VDirectorySizeIndex(object):
+  def __init__(self, rootDirectory: VDirectory) -> None:
+    self.rootDirectory = rootDirectory
+    self.sizes = rootDirectory.GetAllTransitiveSubDirectories()
+    self.sizeMultiset = VSizeMultiset()
+
+    for size in self.sizes.values():
+      self.sizeMultiset.Add(size)
+
+  def GetSize(self, directory: VDirectory) -> int:
+    return self.sizes[directory]
+
+  def AddDirectory(self, parentDirectory: VDirectory, subDirectoryName: str) -> VDirectory:
+    assert subDirectoryName not in parentDirectory.subDirectories
+    subDirectory = VDirectory(parentDirectory)
+    parentDirectory.subDirectories[subDirectoryName] = subDirectory
+    self.sizes[subDirectory] = 0
+    self.sizeMultiset.Add(0)
+    return subDirectory
+
+  def SetFile(self, directory: VDirectory, fileName: str, size: int) -> None:
+    self.UpdateAncestors(directory, size - directory.files.get(fileName, 0))
+    directory.files[fileName] = size
+
+  def RemoveFile(self, directory: VDirectory, fileName: str) -> None:
+    self.UpdateAncestors(directory, -directory.files.pop(fileName))
+
+  def UpdateAncestors(self, directory: VDirectory, sizeDifference: int) -> None:
+    if sizeDifference == 0: return
+    ancestor: Optional[VDirectory] = directory
+
+    while ancestor is not None:
+      self.sizeMultiset.Remove(self.sizes[ancestor])
+      self.sizes[ancestor] += sizeDifference
+      self.sizeMultiset.Add(self.sizes[ancestor])
+      ancestor = ancestor.parentDirectory
+
+  def GetSumOfSizesAtMost(self, size: int) -> int:
+    return self.sizeMultiset.GetSumOfSizesAtMost(size)
+
+  def FindSmallestSizeAtLeast(self, size: int) -> Optional[int]:
+    return self.sizeMultiset.FindSmallestSizeAtLeast(size)
+
 
 def Main() -> None:
-  input = pathlib.Path(__file__).with_name("input.txt").read_text()
-  rootDirectory = ParseDirectoryTree(input)
-  subDirectories = rootDirectory.GetAllTransitiveSubDirectories()
+  inputPath = pathlib.Path(__file__).with_name("input.txt")
+  sumOfSmallSizes = 0
+  rootSize = 0
+
+  with open(inputPath, "rb") as inputFile:
+    for size in StreamDirectorySizes(inputFile):
+      if size <= 100000: sumOfSmallSizes += size
+      rootSize = size
+
   totalSpace = 70000000
   requiredSpace = 30000000
-  freeSpace = totalSpace - subDirectories[rootDirectory]
-  print("Solution of part 1: {}".format(sum(size for size in subDirectories.values() if size <= 100000)))
-  print("Solution of part 2: {}".format(
-    min(size for size in subDirectories.values() if size >= requiredSpace - freeSpace)))
+  freeSpace = totalSpace - rootSize
+
+  with open(inputPath, "rb") as inputFile:
+    smallestSufficientSize = min(size for size in StreamDirectorySizes(inputFile) if size >= requiredSpace - freeSpace)
+
+  print("Solution of part 1: {}".format(sumOfSmallSizes))
+  print("Solution of part 2: {}".format(smallestSufficientSize))
+
+
+def StreamDirectorySizes(lines: Iterable[bytes]) -> Iterator[int]:
+  sizes: List[int] = []
+
+  for line in lines:
+    if line.startswith(b"$ cd "):
+      subDirectoryName = line[5:].strip()
+
+      if subDirectoryName == b"..":
+        yield LeaveDirectory(sizes)
+      elif subDirectoryName == b"/":
+        while len(sizes) > 1:
+          yield LeaveDirectory(sizes)
+
+        if len(sizes) == 0: sizes.append(0)
+      else:
+        sizes.append(0)
+    elif line[:1].isdigit():
+      sizes[-1] += int(line.split(maxsplit=1)[0])
+
+  while len(sizes) > 0:
+    yield LeaveDirectory(sizes)
+
+
+def LeaveDirectory(sizes: List[int]) -> int:
+  size = sizes.pop()
+  if len(sizes) > 0: sizes[-1] += size
+  return size
 
 
 def ParseDirectoryTree(input: str) -> VDirectory:
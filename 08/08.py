@@ -6,98 +6,76 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-import math
+import array
 import pathlib
-from typing import List
+from typing import Iterator, List
 
 
-def Main() -> None:
-  input = pathlib.Path(__file__).with_name("input.txt").read_text()
-  treeHeights = ParseTreeHeights(input)
-  visibleTrees = ComputeVisibleTrees(treeHeights)
-  scenicScores = ComputeScenicScores(treeHeights)
-  print("Solution of part 1: {}".format(sum(sum(row) for row in visibleTrees)))
-  print("Solution of part 2: {}".format(max(max(row) for row in scenicScores)))
-
-
-def ParseTreeHeights(input: str) -> List[List[int]]:
-  return [[int(treeHeight) for treeHeight in line] for line in input.splitlines()]
-
-
-def ComputeVisibleTrees(treeHeights: List[List[int]]) -> List[List[bool]]:
-  numberOfRows = len(treeHeights)
-  numberOfColumns = len(treeHeights[0])
-  visibleTrees = [[True for _ in range(numberOfColumns)] for _ in range(numberOfRows)]
+class VForest(object):
+  def __init__(self, treeHeights: bytes, numberOfRows: int, numberOfColumns: int) -> None:
+    self.treeHeights = treeHeights
+    self.numberOfRows = numberOfRows
+    self.numberOfColumns = numberOfColumns
 
-  for rowIndex in range(numberOfRows):
-    for columnIndex in range(numberOfColumns):
-      treeHeight = treeHeights[rowIndex][columnIndex]
-      isTreeVisible = True
+  @staticmethod
+  def FromString(string: str) -> "VForest":
+    lines = string.splitlines()
+    treeHeights = bytes(ord(character) - 48 for line in lines for character in line)
+    return VForest(treeHeights, len(lines), len(lines[0]))
 
-      for otherRowIndex in range(rowIndex):
-        if treeHeights[otherRowIndex][columnIndex] >= treeHeight:
-          isTreeVisible = False
-          break
+  def GetLinesOfSight(self) -> Iterator[range]:
+    for rowIndex in range(self.numberOfRows):
+      line = range(rowIndex * self.numberOfColumns, (rowIndex + 1) * self.numberOfColumns)
+      yield line
+      yield line[::-1]
 
-      if isTreeVisible: continue
-      isTreeVisible = True
+    for columnIndex in range(self.numberOfColumns):
+      line = range(columnIndex, self.numberOfRows * self.numberOfColumns, self.numberOfColumns)
+      yield line
+      yield line[::-1]
 
-      for otherRowIndex in range(rowIndex + 1, numberOfRows):
-        if treeHeights[otherRowIndex][columnIndex] >= treeHeight:
-          isTreeVisible = False
-          break
+  def ComputeVisibleTrees(self) -> bytearray:
+    treeHeights = self.treeHeights
+    visibleTrees = bytearray(len(treeHeights))
 
-      if isTreeVisible: continue
-      isTreeVisible = True
+    for line in self.GetLinesOfSight():
+      maximumTreeHeight = -1
 
-      for otherColumnIndex in range(columnIndex):
-        if treeHeights[rowIndex][otherColumnIndex] >= treeHeight:
-          isTreeVisible = False
-          break
+      for index in line:
+        treeHeight = treeHeights[index]
 
-      if isTreeVisible: continue
-      isTreeVisible = True
+        if treeHeight > maximumTreeHeight:
+          visibleTrees[index] = 1
+          maximumTreeHeight = treeHeight
 
-      for otherColumnIndex in range(columnIndex + 1, numberOfColumns):
-        if treeHeights[rowIndex][otherColumnIndex] >= treeHeight:
-          isTreeVisible = False
-          break
+    return visibleTrees
 
-      if isTreeVisible: continue
-      visibleTrees[rowIndex][columnIndex] = False
+  def ComputeScenicScores(self) -> "array.array[int]":
+    treeHeights = self.treeHeights
+    scenicScores = array.array("q", [1]) * len(treeHeights)
 
-  return visibleTrees
+    for line in self.GetLinesOfSight():
+      blockingPositions: List[int] = []
 
+      for position, index in enumerate(line):
+        treeHeight = treeHeights[index]
 
-def ComputeScenicScores(treeHeights: List[List[int]]) -> List[List[int]]:
-  numberOfRows = len(treeHeights)
-  numberOfColumns = len(treeHeights[0])
-  scenicScores = [[0 for _ in range(numberOfColumns)] for _ in range(numberOfRows)]
+        while (len(blockingPositions) > 0) and (treeHeights[line[blockingPositions[-1]]] < treeHeight):
+          blockingPositions.pop()
 
-  for rowIndex in range(numberOfRows):
-    for columnIndex in range(numberOfColumns):
-      treeHeight = treeHeights[rowIndex][columnIndex]
-      viewingDistances = [0, 0, 0, 0]
+        scenicScores[index] *= position - (blockingPositions[-1] if len(blockingPositions) > 0 else 0)
+        blockingPositions.append(position)
 
-      for otherRowIndex in range(rowIndex - 1, -1, -1):
-        viewingDistances[0] += 1
-        if treeHeights[otherRowIndex][columnIndex] >= treeHeight: break
+    return scenicScores
 
-      for otherRowIndex in range(rowIndex + 1, numberOfRows):
-        viewingDistances[1] += 1
-        if treeHeights[otherRowIndex][columnIndex] >= treeHeight: break
 
-      for otherColumnIndex in range(columnIndex - 1, -1, -1):
-        viewingDistances[2] += 1
-        if treeHeights[rowIndex][otherColumnIndex] >= treeHeight: break
-
-      for otherColumnIndex in range(columnIndex + 1, numberOfColumns):
-        viewingDistances[3] += 1
-        if treeHeights[rowIndex][otherColumnIndex] >= treeHeight: break
-
-      scenicScores[rowIndex][columnIndex] = math.prod(viewingDistances)
-
-  return scenicScores
+def Main() -> None:
+  input = pathlib.Path(__file__).with_name("input.txt").read_text()
+  forest = VForest.FromString(input)
+  visibleTrees = forest.ComputeVisibleTrees()
+  scenicScores = forest.ComputeScenicScores()
+  print("Solution of part 1: {}".format(sum(visibleTrees)))
+  print("Solution of part 2: {}".format(max(scenicScores)))
 
 
 if __name__ == "__main__": Main()
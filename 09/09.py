@@ -7,71 +7,51 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
 import pathlib
-from typing import Iterable, Tuple, List
+from typing import Iterable, Iterator, List, Sequence, Set, Tuple
+
+
+gPackingFactor = 1 << 32
+gDirections = {"L": (-1, 0), "R": (1, 0), "D": (0, -1), "U": (0, 1)}
 
 
 def Main() -> None:
-  input = pathlib.Path(__file__).with_name("input.txt").read_text()
-  headMoves = ParseHeadMoves(input)
-  numberOfKnots = 10
-  allKnotsPositions = [ExecuteHeadMoves(headMoves)]
-
-  for _ in range(numberOfKnots - 1):
-    allKnotsPositions.append(ExecuteKnotMoves(allKnotsPositions[-1]))
-
-  print("Solution of part 1: {}".format(len(set(allKnotsPositions[1]))))
-  print("Solution of part 2: {}".format(len(set(allKnotsPositions[-1]))))
-
-
-def ParseHeadMoves(input: str) -> List[Tuple[str, int]]:
-  parts = [line.split() for line in input.splitlines()]
-  return [(line[0], int(line[1])) for line in parts]
-
-
-def ExecuteHeadMoves(headMoves: Iterable[Tuple[str, int]]) -> List[Tuple[int, int]]:
-  headPosition = [0, 0]
-  headPositions = [(0, 0)]
-
-  for headMove in headMoves:
-    for _ in range(headMove[1]):
-      if headMove[0] == "L":
-        headPosition[0] -= 1
-      elif headMove[0] == "R":
-        headPosition[0] += 1
-      elif headMove[0] == "D":
-        headPosition[1] -= 1
-      elif headMove[0] == "U":
-        headPosition[1] += 1
-
-      headPositions.append((headPosition[0], headPosition[1]))
-
-  return headPositions
-
-
-def ExecuteKnotMoves(otherKnotPositions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
-  knotPosition = [0, 0]
-  knotPositions = [(0, 0)]
-
-  for otherKnotPosition in otherKnotPositions[1:]:
-    if knotPosition[0] == otherKnotPosition[0]:
-      if knotPosition[1] <= otherKnotPosition[1] - 2:
-        knotPosition[1] = otherKnotPosition[1] - 1
-      elif knotPosition[1] >= otherKnotPosition[1] + 2:
-        knotPosition[1] = otherKnotPosition[1] + 1
-    elif knotPosition[1] == otherKnotPosition[1]:
-      if knotPosition[0] <= otherKnotPosition[0] - 2:
-        knotPosition[0] = otherKnotPosition[0] - 1
-      elif knotPosition[0] >= otherKnotPosition[0] + 2:
-        knotPosition[0] = otherKnotPosition[0] + 1
-    elif ((abs(knotPosition[0] - otherKnotPosition[0]) <= 1) and (abs(knotPosition[1] - otherKnotPosition[1]) <= 1)):
-      pass
-    else:
-      knotPosition[0] += 2 * int(knotPosition[0] < otherKnotPosition[0]) - 1
-      knotPosition[1] += 2 * int(knotPosition[1] < otherKnotPosition[1]) - 1
-
-    knotPositions.append((knotPosition[0], knotPosition[1]))
-
-  return knotPositions
+  with open(pathlib.Path(__file__).with_name("input.txt")) as inputFile:
+    allVisitedPositions = SimulateRope(ParseHeadMoves(inputFile), 10, [1, 9])
+
+  print("Solution of part 1: {}".format(len(allVisitedPositions[0])))
+  print("Solution of part 2: {}".format(len(allVisitedPositions[1])))
+
+
+def ParseHeadMoves(lines: Iterable[str]) -> Iterator[Tuple[str, int]]:
+  for line in lines:
+    parts = line.split()
+    if len(parts) > 0: yield (parts[0], int(parts[1]))
+
+
+def SimulateRope(headMoves: Iterable[Tuple[str, int]], numberOfKnots: int,
+                 reportedKnotIndices: Sequence[int]) -> List[Set[int]]:
+  xs = numberOfKnots * [0]
+  ys = numberOfKnots * [0]
+  allVisitedPositions: List[Set[int]] = [{0} for _ in reportedKnotIndices]
+
+  for direction, numberOfSteps in headMoves:
+    deltaX, deltaY = gDirections[direction]
+
+    for _ in range(numberOfSteps):
+      xs[0] += deltaX
+      ys[0] += deltaY
+
+      for knotIndex in range(1, numberOfKnots):
+        distanceX = xs[knotIndex - 1] - xs[knotIndex]
+        distanceY = ys[knotIndex - 1] - ys[knotIndex]
+        if (-1 <= distanceX <= 1) and (-1 <= distanceY <= 1): break
+        xs[knotIndex] += (distanceX > 0) - (distanceX < 0)
+        ys[knotIndex] += (distanceY > 0) - (distanceY < 0)
+
+      for visitedPositions, knotIndex in zip(allVisitedPositions, reportedKnotIndices):
+        visitedPositions.add(xs[knotIndex] * gPackingFactor + ys[knotIndex])
+
+  return allVisitedPositions
 
 
 if __name__ == "__main__": Main()
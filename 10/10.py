@@ -6,49 +6,74 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import itertools
 import pathlib
-from typing import List
+import re
+from typing import Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+import numpy.typing as npt
 
 
 def Main() -> None:
-  input = pathlib.Path(__file__).with_name("input.txt").read_text()
-  xs = RunProgram(input)
-  pixels = DrawPixels(xs)
-  print("Solution of part 1: {}".format(sum((cycle + 1) * xs[cycle] for cycle in range(19, 240, 40))))
+  program = pathlib.Path(__file__).with_name("input.txt").read_bytes()
+  samples = SampleRegister(RunProgram(program), range(20, 221, 40))
+  pixels = next(RenderFrames((x for _, x in RunProgram(program)), 6, 40))
+  print("Solution of part 1: {}".format(sum(cycle * x for cycle, x in samples.items())))
   print("Solution of part 2:\n{}".format(FormatPixels(pixels)))
 
 
-def RunProgram(input: str) -> List[int]:
+def RunProgram(program: bytes) -> Iterator[Tuple[int, int]]:
   x = 1
-  xs = [x]
-
-  for line in input.splitlines():
-    if line == "noop":
-      xs.append(x)
+  cycle = 1
+
+  for lineMatch in re.finditer(rb"[^\n]+", program):
+    instruction = lineMatch.group().strip()
+    if len(instruction) == 0: continue
+
+    if instruction == b"noop":
+      yield (cycle, x)
+      cycle += 1
+    elif instruction.startswith(b"addx "):
+      value = int(instruction[5:])
+      yield (cycle, x)
+      yield (cycle + 1, x)
+      cycle += 2
+      x += value
     else:
-      xs.append(x)
-      x += int(line.split()[1])
-      xs.append(x)
+      raise RuntimeError(f"Unknown instruction {instruction.decode()!r}.")
+
+  yield (cycle, x)
+
+
+def SampleRegister(trace: Iterable[Tuple[int, int]], cycles: Iterable[int]) -> Dict[int, int]:
+  remainingCycles = sorted(set(cycles), reverse=True)
+  samples = {}
+
+  for cycle, x in trace:
+    while (len(remainingCycles) > 0) and (remainingCycles[-1] <= cycle):
+      if remainingCycles.pop() == cycle: samples[cycle] = x
 
-  return xs
+    if len(remainingCycles) == 0: break
 
+  return samples
 
-def DrawPixels(xs: List[int]) -> List[List[bool]]:
-  numberOfRows = 6
-  numberOfColumns = 40
-  pixels = [[False for _ in range(numberOfColumns)] for _ in range(numberOfRows)]
 
-  for cycle, x in enumerate(xs):
-    rowIndex = cycle // numberOfColumns
-    columnIndex = cycle % numberOfColumns
-    if rowIndex >= numberOfRows: break
-    if abs(x - columnIndex) <= 1: pixels[rowIndex][columnIndex] = True
+def RenderFrames(xs: Iterable[int], numberOfRows: int, numberOfColumns: int) -> Iterator[npt.NDArray[np.bool_]]:
+  numberOfPixels = numberOfRows * numberOfColumns
+  columnIndices = np.arange(numberOfPixels) % numberOfColumns
+  xsIterator = iter(xs)
 
-  return pixels
+  while True:
+    frameXs = np.fromiter(itertools.islice(xsIterator, numberOfPixels), dtype=np.int64)
+    if frameXs.size == 0: break
+    pixels = np.zeros(numberOfPixels, dtype=np.bool_)
+    pixels[:frameXs.size] = np.abs(frameXs - columnIndices[:frameXs.size]) <= 1
+    yield pixels.reshape(numberOfRows, numberOfColumns)
 
 
-def FormatPixels(pixels: List[List[bool]]) -> str:
-  return "\n".join("".join("#" if pixel else "." for pixel in row) for row in pixels)
+def FormatPixels(pixels: npt.NDArray[np.bool_]) -> str:
+  return "\n".join("".join(row) for row in np.where(pixels, "#", "."))
 
 
 if __name__ == "__main__": Main()
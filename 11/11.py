@@ -9,7 +9,7 @@
 import math
 import pathlib
 import re
-from typing import Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 
 class VMonkey(object):
@@ -61,19 +61,26 @@ class VMonkey(object):
     return VMonkey(startingItems, operation, rightOperand, divisor, divisibleTargetMonkeyIndex,
                    notDivisibleTargetMonkeyIndex, divideBy3)
 
-  def PlayTurn(self) -> None:
-    for oldItem in self.items:
-      rightOperand = self.rightOperand if self.rightOperand is not None else oldItem
+  def InspectItem(self, oldItem: int) -> int:
+    rightOperand = self.rightOperand if self.rightOperand is not None else oldItem
+
+    if self.operation == "+":
+      newItem = oldItem + rightOperand
+    elif self.operation == "*":
+      newItem = oldItem * rightOperand
+    else:
+      raise RuntimeError(f"Unknown operation {self.operation!r}.")
 
-      if self.operation == "+":
-        newItem = oldItem + rightOperand
-      elif self.operation == "*":
-        newItem = oldItem * rightOperand
-      else:
-        raise RuntimeError(f"Unknown operation {self.operation!r}.")
+    if self.divideBy3: newItem //= 3
+    if self.modulus > 0: newItem %= self.modulus
+    return newItem
 
-      if self.divideBy3: newItem //= 3
-      if self.modulus > 0: newItem %= self.modulus
+  def GetTargetMonkeyIndex(self, item: int) -> int:
+    return self.divisibleTargetMonkeyIndex if item % self.divisor == 0 else self.notDivisibleTargetMonkeyIndex
+
+  def PlayTurn(self) -> None:
+    for oldItem in self.items:
+      newItem = self.InspectItem(oldItem)
       targetMonkey = self.divisibleTargetMonkey if newItem % self.divisor == 0 else self.notDivisibleTargetMonkey
       assert targetMonkey is not None
       targetMonkey.items.append(newItem)
@@ -87,7 +94,7 @@ def Main() -> None:
   monkeysWithDivideBy3 = CreateMonkeys(input, True)
   PlayRounds(monkeysWithDivideBy3, 20)
   monkeysWithoutDivideBy3 = CreateMonkeys(input, False)
-  PlayRounds(monkeysWithoutDivideBy3, 10000)
+  PlayRoundsByItem(monkeysWithoutDivideBy3, 10000)
   print("Solution of part 1: {}".format(GetScore(monkeysWithDivideBy3)))
   print("Solution of part 2: {}".format(GetScore(monkeysWithoutDivideBy3)))
 
@@ -110,6 +117,56 @@ def PlayRounds(monkeys: Sequence[VMonkey], numberOfRounds: int) -> None:
       monkey.PlayTurn()
 
 
+def PlayRoundsByItem(monkeys: Sequence[VMonkey], numberOfRounds: int) -> None:
+  itemStates = [(monkeyIndex, item) for monkeyIndex, monkey in enumerate(monkeys) for item in monkey.items]
+
+  for monkey in monkeys:
+    monkey.items.clear()
+
+  for itemState in itemStates:
+    (monkeyIndex, item), numbersOfInspectedItems = PlayRoundsForItem(monkeys, itemState, numberOfRounds)
+    monkeys[monkeyIndex].items.append(item)
+
+    for monkey, numberOfInspectedItems in zip(monkeys, numbersOfInspectedItems):
+      monkey.numberOfInspectedItems += numberOfInspectedItems
+
+
+def PlayRoundsForItem(monkeys: Sequence[VMonkey], itemState: Tuple[int, int],
+                      numberOfRounds: int) -> Tuple[Tuple[int, int], List[int]]:
+  roundIndices: Dict[Tuple[int, int], int] = {}
+  itemStates: List[Tuple[int, int]] = []
+  numbersOfInspectedItemsHistory: List[List[int]] = []
+  numbersOfInspectedItems = len(monkeys) * [0]
+
+  for roundIndex in range(numberOfRounds):
+    if itemState in roundIndices:
+      cycleStart = roundIndices[itemState]
+      numberOfCycles, numberOfRemainingRounds = divmod(numberOfRounds - cycleStart, roundIndex - cycleStart)
+      startNumbers = numbersOfInspectedItemsHistory[cycleStart]
+      endNumbers = numbersOfInspectedItemsHistory[cycleStart + numberOfRemainingRounds]
+      return itemStates[cycleStart + numberOfRemainingRounds], [
+        startNumber + numberOfCycles * (numberOfInspectedItems - startNumber) + endNumber - startNumber
+        for startNumber, endNumber, numberOfInspectedItems in zip(startNumbers, endNumbers, numbersOfInspectedItems)
+      ]
+
+    roundIndices[itemState] = roundIndex
+    itemStates.append(itemState)
+    numbersOfInspectedItemsHistory.append(list(numbersOfInspectedItems))
+    monkeyIndex, item = itemState
+
+    while True:
+      numbersOfInspectedItems[monkeyIndex] += 1
+      item = monkeys[monkeyIndex].InspectItem(item)
+      targetMonkeyIndex = monkeys[monkeyIndex].GetTargetMonkeyIndex(item)
+      isRoundOver = targetMonkeyIndex <= monkeyIndex
+      monkeyIndex = targetMonkeyIndex
+      if isRoundOver: break
+
+    itemState = (monkeyIndex, item)
+
+  return itemState, numbersOfInspectedItems
+
+
 def GetScore(monkeys: Iterable[VMonkey]) -> int:
   sortedMonkeys = sorted(monkeys, key=lambda monkey: monkey.numberOfInspectedItems, reverse=True)
   return sortedMonkeys[0].numberOfInspectedItems * sortedMonkeys[1].numberOfInspectedItems
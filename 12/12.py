@@ -6,8 +6,9 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import array
 import pathlib
-from typing import cast, Iterable, List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple
 
 
 class VMap(object):
@@ -15,6 +16,20 @@ class VMap(object):
     self.heights = [list(row) for row in heights]
     self.start = start
     self.end = end
+    self.numberOfRows = len(self.heights)
+    self.numberOfColumns = len(self.heights[0])
+    paddedNumberOfColumns = self.numberOfColumns + 2
+    self.flatHeights = array.array("b", bytes(paddedNumberOfColumns * (self.numberOfRows + 2)))
+    borderCells = bytearray(b"\x01") * len(self.flatHeights)
+
+    for rowIndex, row in enumerate(self.heights):
+      for columnIndex, height in enumerate(row):
+        index = self.GetIndex((rowIndex, columnIndex))
+        self.flatHeights[index] = height
+        borderCells[index] = 0
+
+    self.borderCells = bytes(borderCells)
+    self.neighborOffsets = (-paddedNumberOfColumns, paddedNumberOfColumns, -1, 1)
 
   def __str__(self) -> str:
     string = ""
@@ -56,30 +71,45 @@ class VMap(object):
 
     return VMap(heights, start, end)
 
-  def ComputeDistances(self) -> List[List[Optional[int]]]:
-    numberOfRows = len(self.heights)
-    numberOfColumns = len(self.heights[0])
-    distances = cast(List[List[Optional[int]]], [numberOfColumns * [None] for _ in range(numberOfRows)])
-    distances[self.end[0]][self.end[1]] = 0
-    nextNodes = [self.end]
+  def GetIndex(self, point: Tuple[int, int]) -> int:
+    return (point[0] + 1) * (self.numberOfColumns + 2) + point[1] + 1
+
+  def GetPointsWithHeight(self, height: int) -> List[Tuple[int, int]]:
+    return [(rowIndex, columnIndex) for rowIndex, row in enumerate(self.heights)
+            for columnIndex, otherHeight in enumerate(row) if otherHeight == height]
+
+  def ComputeDistances(self,
+                       sources: Optional[Iterable[Tuple[int, int]]] = None,
+                       targets: Optional[Iterable[Tuple[int, int]]] = None,
+                       isReversed: bool = True) -> "array.array[int]":
+    heights = self.flatHeights
+    sign = 1 if isReversed else -1
+    distances = array.array("i", [-1]) * len(heights)
+    isVisited = bytearray(self.borderCells)
+    frontier = [self.GetIndex(source) for source in (sources if sources is not None else [self.end])]
+    targetIndices = frozenset(self.GetIndex(target) for target in targets) if targets is not None else frozenset()
+    distance = 0
+
+    for index in frontier:
+      distances[index] = 0
+      isVisited[index] = 1
+
+    while (len(frontier) > 0) and targetIndices.isdisjoint(frontier):
+      distance += 1
+      nextFrontier = []
 
-    while len(nextNodes) > 0:
-      node = nextNodes.pop()
+      for index in frontier:
+        height = heights[index]
 
-      possibleNeighborDistance = cast(int, distances[node[0]][node[1]]) + 1
-      neighbors = []
-      if node[0] > 0: neighbors.append((node[0] - 1, node[1]))
-      if node[0] < numberOfRows - 1: neighbors.append((node[0] + 1, node[1]))
-      if node[1] > 0: neighbors.append((node[0], node[1] - 1))
-      if node[1] < numberOfColumns - 1: neighbors.append((node[0], node[1] + 1))
+        for offset in self.neighborOffsets:
+          neighborIndex = index + offset
 
-      for neighbor in neighbors:
-        neighborDistance = distances[neighbor[0]][neighbor[1]]
+          if (not isVisited[neighborIndex]) and (sign * (heights[neighborIndex] - height) >= -1):
+            isVisited[neighborIndex] = 1
+            distances[neighborIndex] = distance
+            nextFrontier.append(neighborIndex)
 
-        if ((self.heights[neighbor[0]][neighbor[1]] >= self.heights[node[0]][node[1]] - 1)
-            and ((neighborDistance is None) or (possibleNeighborDistance < neighborDistance))):
-          distances[neighbor[0]][neighbor[1]] = possibleNeighborDistance
-          nextNodes.append(neighbor)
+      frontier = nextFrontier
 
     return distances
 
@@ -87,11 +117,12 @@ class VMap(object):
 def Main() -> None:
   input = pathlib.Path(__file__).with_name("input.txt").read_text()
   map = VMap.FromString(input)
-  distances = map.ComputeDistances()
-  print("Solution of part 1: {}".format(distances[map.start[0]][map.start[1]]))
+  distances = map.ComputeDistances(targets=[map.start])
+  lowPoints = map.GetPointsWithHeight(0)
+  lowDistances = map.ComputeDistances(targets=lowPoints)
+  print("Solution of part 1: {}".format(distances[map.GetIndex(map.start)]))
   print("Solution of part 2: {}".format(
-    min(distance for heightsRow, distancesRow in zip(map.heights, distances)
-        for height, distance in zip(heightsRow, distancesRow) if (height == 0) and (distance is not None))))
+    min(lowDistances[map.GetIndex(lowPoint)] for lowPoint in lowPoints if lowDistances[map.GetIndex(lowPoint)] >= 0)))
 
 
 if __name__ == "__main__": Main()
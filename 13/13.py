@@ -6,57 +6,140 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-import functools
+import heapq
 import math
 import pathlib
-from typing import Any, List, Optional, Sequence, Tuple
+import re
+import struct
+import tempfile
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+gCloseRunTag = 1
+gOpenRunTag = 2
+gIntegerTag = 3
 
 
 def Main() -> None:
   input = pathlib.Path(__file__).with_name("input.txt").read_text()
-  packetPairs = ParsePacketPairs(input)
+  packets = ParsePackets(input)
+  packetPairs = list(zip(packets[0::2], packets[1::2]))
   arePacketPairsEqual = [AreDataInRightOrder(left, right) for left, right in packetPairs]
-  dividerPackets = [[[2]], [[6]]]
-  packets = [packet for left, right in packetPairs for packet in [left, right]] + dividerPackets
-  packets.sort(key=functools.cmp_to_key(CompareData))
+  dividerPacketKeys = EncodePackets("[[2]]\n[[6]]")
   print("Solution of part 1: {}".format(
     sum(packetPairIndex + 1 for packetPairIndex, isPacketPairEqual in enumerate(arePacketPairsEqual)
         if isPacketPairEqual)))
-  print("Solution of part 2: {}".format(ComputeDecoderKey(packets, dividerPackets)))
-
-
-def ParsePacketPairs(string: str) -> List[Tuple[Any, Any]]:
-  pairsLines = [pair.splitlines() for pair in string.split("\n\n")]
-  return [(ParseData(pairLines[0]), ParseData(pairLines[1])) for pairLines in pairsLines]
-
-
-def ParseData(string: str) -> Any:
-  if string[0] == "[":
-    assert string[-1] == "]"
-    item = ""
-    items = []
-    level = 0
-
-    for character in string:
-      if character == "[":
-        if level > 0: item += "["
-        level += 1
-      elif character == "]":
-        level -= 1
-        if level > 0: item += "]"
-      elif character == ",":
-        if level <= 1:
-          items.append(item)
-          item = ""
-        else:
-          item += character
-      else:
-        item += character
-
-    if item != "": items.append(item)
-    return [ParseData(item) for item in items]
-  else:
-    return int(string)
+  print("Solution of part 2: {}".format(ComputeDecoderKey(EncodePackets(input), dividerPacketKeys)))
+
+
+def ParsePackets(string: str) -> List[Any]:
+  packets: List[Any] = []
+  openLists: List[List[Any]] = []
+
+  for token in re.findall(r"[\[\]]|[0-9]+", string):
+    if token == "[":
+      openLists.append([])
+      continue
+
+    item = openLists.pop() if token == "]" else int(token)
+
+    if len(openLists) > 0:
+      openLists[-1].append(item)
+    else:
+      packets.append(item)
+
+  assert len(openLists) == 0
+  return packets
+
+
+def EncodePackets(string: str) -> List[bytes]:
+  keys: List[bytes] = []
+  key = bytearray()
+  depth = 0
+  isInOpenRun = False
+  isInCloseRun = False
+
+  for token in re.findall(r"[\[\]]|[0-9]+", string):
+    if token == "]":
+      if isInOpenRun: key += struct.pack(">BH", gOpenRunTag, depth)
+      depth -= 1
+      isInOpenRun = False
+      isInCloseRun = True
+
+      if depth == 0:
+        key += struct.pack(">BH", gCloseRunTag, depth)
+        keys.append(bytes(key))
+        key.clear()
+        isInCloseRun = False
+
+      continue
+
+    if isInCloseRun: key += struct.pack(">BH", gCloseRunTag, depth)
+    isInCloseRun = False
+
+    if token == "[":
+      depth += 1
+      isInOpenRun = True
+    else:
+      integer = int(token)
+      numberOfBytes = (integer.bit_length() + 7) // 8
+      key += struct.pack(">BB", gIntegerTag, numberOfBytes) + integer.to_bytes(numberOfBytes, "big")
+      isInOpenRun = False
+      isInCloseRun = True
+
+  assert depth == 0
+  return keys
+
+
+def EncodePacket(string: str) -> bytes:
+  keys = EncodePackets(string)
+  assert len(keys) == 1
+  return keys[0]
+
+
+def SortPacketFile(inputPath: pathlib.Path, outputPath: pathlib.Path, numberOfPacketsPerChunk: int = 100000) -> None:
+  with tempfile.TemporaryDirectory() as temporaryDirectoryPath:
+    chunkPaths: List[pathlib.Path] = []
+
+    with open(inputPath, "rb") as inputFile:
+      while True:
+        chunk = []
+
+        for line in inputFile:
+          line = line.strip()
+          if len(line) > 0: chunk.append((EncodePacket(line.decode()), line))
+          if len(chunk) == numberOfPacketsPerChunk: break
+
+        if len(chunk) == 0: break
+        chunk.sort(key=lambda keyAndLine: keyAndLine[0])
+        chunkPath = pathlib.Path(temporaryDirectoryPath) / f"{len(chunkPaths)}.bin"
+
+        with open(chunkPath, "wb") as outputChunkFile:
+          for key, line in chunk:
+            outputChunkFile.write(struct.pack(">II", len(key), len(line)) + key + line)
+
+        chunkPaths.append(chunkPath)
+        if len(chunk) < numberOfPacketsPerChunk: break
+
+    chunkFiles = [open(chunkPath, "rb") for chunkPath in chunkPaths]
+
+    try:
+      with open(outputPath, "wb") as outputFile:
+        for _, line in heapq.merge(*(ReadPacketChunk(chunkFile) for chunkFile in chunkFiles),
+                                   key=lambda keyAndLine: keyAndLine[0]):
+          outputFile.write(line + b"\n")
+    finally:
+      for chunkFile in chunkFiles:
+        chunkFile.close()
+
+
+def ReadPacketChunk(chunkFile: BinaryIO) -> Iterator[Tuple[bytes, bytes]]:
+  header = chunkFile.read(8)
+
+  while len(header) == 8:
+    keyLength, lineLength = struct.unpack(">II", header)
+    yield chunkFile.read(keyLength), chunkFile.read(lineLength)
+    header = chunkFile.read(8)
 
 
 def AreDataInRightOrder(left: Any, right: Any) -> Optional[bool]:
@@ -74,14 +157,17 @@ def AreDataInRightOrder(left: Any, right: Any) -> Optional[bool]:
     return len(left) < len(right) if len(left) != len(right) else None
 
 
-def CompareData(left: Any, right: Any) -> int:
-  areDataInRightOrder = AreDataInRightOrder(left, right)
-  assert areDataInRightOrder is not None
-  return -1 if areDataInRightOrder else 1
+def ComputeDecoderKey(packetKeys: Iterable[bytes], dividerPacketKeys: Sequence[bytes]) -> int:
+  dividerPacketIndices = [
+    sum(otherDividerPacketKey < dividerPacketKey for otherDividerPacketKey in dividerPacketKeys) + 1
+    for dividerPacketKey in dividerPacketKeys
+  ]
 
+  for packetKey in packetKeys:
+    for dividerPacketIndex, dividerPacketKey in enumerate(dividerPacketKeys):
+      if packetKey < dividerPacketKey: dividerPacketIndices[dividerPacketIndex] += 1
 
-def ComputeDecoderKey(packets: Sequence[Any], dividerPackets: Sequence[Any]) -> int:
-  return math.prod(packets.index(dividerPacket) + 1 for dividerPacket in dividerPackets)
+  return math.prod(dividerPacketIndices)
 
 
 if __name__ == "__main__": Main()
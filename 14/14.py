@@ -6,25 +6,89 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-import copy
-import enum
 import pathlib
-from typing import Optional, Set, Tuple
+from typing import Iterable, Optional, Set, Tuple
+
+
+class VCave(object):
+  def __init__(self,
+               rockPoints: Iterable[Tuple[int, int]],
+               sandPoint: Tuple[int, int],
+               floorY: Optional[int] = None) -> None:
+    self.rockPoints = list(rockPoints)
+    self.sandPoint = sandPoint
+    self.maximumRockY = max(y for _, y in self.rockPoints)
+    self.floorY = floorY if floorY is not None else self.maximumRockY + 2
+    depth = self.floorY - sandPoint[1]
+    self.minimumX = min(min(x for x, _ in self.rockPoints), sandPoint[0] - depth) - 1
+    self.width = max(max(x for x, _ in self.rockPoints), sandPoint[0] + depth) + 2 - self.minimumX
+    self.rockCells: Optional[bytes] = None
+    self.rockRows = self.floorY * [0]
+
+    for rockPoint in self.rockPoints:
+      if rockPoint[1] < self.floorY: self.rockRows[rockPoint[1]] |= 1 << (rockPoint[0] - self.minimumX)
+
+  def GetIndex(self, point: Tuple[int, int]) -> int:
+    return point[1] * self.width + point[0] - self.minimumX
+
+  def GetRockCells(self) -> bytes:
+    if self.rockCells is None:
+      rockCells = bytearray(self.width * self.floorY)
+
+      for rockPoint in self.rockPoints:
+        if rockPoint[1] < self.floorY: rockCells[self.GetIndex(rockPoint)] = 1
+
+      self.rockCells = bytes(rockCells)
+
+    return self.rockCells
+
+  def AddSand(self, useFloor: bool = False) -> int:
+    cells = bytearray(self.GetRockCells())
+    width = self.width
+    bottomRowStart = ((self.floorY - 1) if useFloor else self.maximumRockY) * width
+    sandIndex = self.GetIndex(self.sandPoint)
+    trail = [] if cells[sandIndex] else [sandIndex]
+    numberOfUnitsOfSand = 0
+
+    while len(trail) > 0:
+      index = trail[-1]
+
+      if index < bottomRowStart:
+        if not cells[index + width]:
+          trail.append(index + width)
+          continue
+        elif not cells[index + width - 1]:
+          trail.append(index + width - 1)
+          continue
+        elif not cells[index + width + 1]:
+          trail.append(index + width + 1)
+          continue
+      elif not useFloor:
+        break
+
+      cells[index] = 2
+      trail.pop()
+      numberOfUnitsOfSand += 1
+
+    return numberOfUnitsOfSand
+
+  def CountSandWithFloor(self) -> int:
+    rowMask = (1 << self.width) - 1
+    sandRow = (1 << (self.sandPoint[0] - self.minimumX)) & ~self.rockRows[self.sandPoint[1]]
+    numberOfUnitsOfSand = sandRow.bit_count()
 
+    for rockRow in self.rockRows[self.sandPoint[1] + 1:]:
+      sandRow = (sandRow | (sandRow << 1) | (sandRow >> 1)) & ~rockRow & rowMask
+      numberOfUnitsOfSand += sandRow.bit_count()
 
-class VSandEvents(enum.Enum):
-  success = 0
-  abyss = 1
-  sourceBlocked = 2
+    return numberOfUnitsOfSand
 
 
 def Main() -> None:
   input = pathlib.Path(__file__).with_name("input.txt").read_text()
-  sandPoint = (500, 0)
-  cave = ParseCave(input)
-  floorY = max(point[1] for point in cave) + 2
-  print("Solution of part 1: {}".format(AddSand(sandPoint, copy.deepcopy(cave))))
-  print("Solution of part 2: {}".format(AddSand(sandPoint, copy.deepcopy(cave), floorY)))
+  cave = VCave(ParseCave(input), (500, 0))
+  print("Solution of part 1: {}".format(cave.AddSand()))
+  print("Solution of part 2: {}".format(cave.CountSandWithFloor()))
 
 
 def ParseCave(string: str) -> Set[Tuple[int, int]]:
@@ -47,36 +111,6 @@ def ParseCave(string: str) -> Set[Tuple[int, int]]:
   return cave
 
 
-def AddSand(sandPoint: Tuple[int, int], cave: Set[Tuple[int, int]], floorY: Optional[int] = None) -> int:
-  numberOfUnitsOfSand = 0
-
-  while AddUnitOfSand(sandPoint, cave, floorY=floorY) == VSandEvents.success:
-    numberOfUnitsOfSand += 1
-
-  return numberOfUnitsOfSand
-
-
-def AddUnitOfSand(sandPoint: Tuple[int, int], cave: Set[Tuple[int, int]], floorY: Optional[int] = None) -> VSandEvents:
-  if sandPoint in cave: return VSandEvents.sourceBlocked
-  maximumY = floorY if floorY is not None else max(point[1] for point in cave)
-
-  while sandPoint[1] <= maximumY:
-    isStepSuccessful = False
-
-    for possibleNextSandPoint in [(sandPoint[0], sandPoint[1] + 1), (sandPoint[0] - 1, sandPoint[1] + 1),
-                                  (sandPoint[0] + 1, sandPoint[1] + 1)]:
-      if (possibleNextSandPoint not in cave) and ((floorY is None) or (possibleNextSandPoint[1] < floorY)):
-        sandPoint = possibleNextSandPoint
-        isStepSuccessful = True
-        break
-
-    if not isStepSuccessful:
-      cave.add(sandPoint)
-      return VSandEvents.success
-
-  return VSandEvents.abyss
-
-
 def ParsePoint(string: str) -> Tuple[int, int]:
   items = string.split(",")
   return (int(items[0]), int(items[1]))
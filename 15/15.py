@@ -34,7 +34,7 @@ def ParseSensors(string: str) -> Dict[Tuple[int, int], Tuple[int, int]]:
 
 
 def ComputeCoverageIntervalAtY(sensor: Tuple[int, int], nearestBeacon: Tuple[int, int], y: int) -> Tuple[int, int]:
-  distance = abs(sensor[0] - nearestBeacon[0]) + abs(sensor[1] - nearestBeacon[1])
+  distance = ComputeDistance(sensor, nearestBeacon)
   intervalWidth = distance - abs(sensor[1] - y)
   return (sensor[0] - intervalWidth, sensor[0] + intervalWidth) if intervalWidth >= 0 else (0, -1)
 
@@ -63,43 +63,47 @@ def FindFirstMissingCoveragePoint(
   lower: Tuple[int, int],
   upper: Tuple[int, int],
 ) -> Optional[Tuple[int, int]]:
-  for y in range(lower[1], upper[1] + 1):
-    coverageIntervals = [
-      ComputeCoverageIntervalAtY(sensor, nearestBeacon, y) for sensor, nearestBeacon in sensors.items()
-    ]
-    missingCoverageEnd, missingCoverageIntervals, missingCoverageStart = ComputeComplementOfIntervalUnion(
-      coverageIntervals)
+  rotatedSquares = [(sensor[0] + sensor[1], sensor[0] - sensor[1], ComputeDistance(sensor, nearestBeacon))
+                    for sensor, nearestBeacon in sensors.items()]
+  us = ComputeBreakpoints([(u - distance, u + distance + 1) for u, _, distance in rotatedSquares],
+                          (lower[0] + lower[1], upper[0] + upper[1] + 1))
+  vs = ComputeBreakpoints([(v - distance, v + distance + 1) for _, v, distance in rotatedSquares],
+                          (lower[0] - upper[1], upper[0] - lower[1] + 1))
+  missingCoveragePoints = [
+    FindFirstPointInRotatedCell(uInterval, vInterval, lower, upper) for uInterval in zip(us[:-1], us[1:])
+    for vInterval in zip(vs[:-1], vs[1:]) if not IsRotatedCellCovered(uInterval, vInterval, rotatedSquares)
+  ]
+  return min((point for point in missingCoveragePoints if point is not None),
+             key=lambda point: (point[1], point[0]),
+             default=None)
 
-    if missingCoverageEnd >= lower[0]:
-      return (lower[0], y)
-    elif missingCoverageStart <= lower[1]:
-      return (missingCoverageStart, y)
-    elif len(missingCoverageIntervals) > 0:
-      return (missingCoverageIntervals[0][0], y)
 
-  return None
+def IsRotatedCellCovered(uInterval: Tuple[int, int], vInterval: Tuple[int, int],
+                         rotatedSquares: Sequence[Tuple[int, int, int]]) -> bool:
+  for u, v, distance in rotatedSquares:
+    if ((u - distance <= uInterval[0]) and (uInterval[1] <= u + distance + 1) and (v - distance <= vInterval[0])
+        and (vInterval[1] <= v + distance + 1)):
+      return True
 
+  return False
 
-def ComputeComplementOfIntervalUnion(intervals: Sequence[Tuple[int, int]]) -> Tuple[int, List[Tuple[int, int]], int]:
-  if len(intervals) == 0: return 0, [], 0
-  events = sorted(event for interval in intervals for event in ((interval[0], True), (interval[1], False))
-                  if interval[0] < interval[1])
-  complementIntervals: List[Tuple[int, int]] = []
-  numberOfCurrentIntervals = 0
-  previousX = None
 
-  for x, isStart in events:
-    if (numberOfCurrentIntervals == 0) and (previousX is not None) and (x - previousX >= 2):
-      complementIntervals.append((previousX + 1, x - 1))
+def ComputeBreakpoints(intervals: Sequence[Tuple[int, int]], bounds: Tuple[int, int]) -> List[int]:
+  breakpoints = {breakpoint for interval in intervals for breakpoint in interval if bounds[0] < breakpoint < bounds[1]}
+  return sorted(breakpoints | {bounds[0], bounds[1]})
 
-    previousX = x
 
-    if isStart:
-      numberOfCurrentIntervals += 1
-    else:
-      numberOfCurrentIntervals -= 1
+def FindFirstPointInRotatedCell(uInterval: Tuple[int, int], vInterval: Tuple[int, int], lower: Tuple[int, int],
+                                upper: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+  u0, u1 = uInterval[0], uInterval[1] - 1
+  v0, v1 = vInterval[0], vInterval[1] - 1
+  y = max(lower[1], lower[0] - v1, u0 - upper[0], -((v1 - u0) // 2))
+  if y > min(upper[1], u1 - lower[0], upper[0] - v0, (u1 - v0) // 2): return None
+  return (max(lower[0], u0 - y, v0 + y), y)
+
 
-  return events[0][0] - 1, complementIntervals, events[-1][0] + 1
+def ComputeDistance(point1: Tuple[int, int], point2: Tuple[int, int]) -> int:
+  return abs(point1[0] - point2[0]) + abs(point1[1] - point2[1])
 
 
 def ComputeTuningFrequency(point: Tuple[int, int]) -> int:
@@ -6,10 +6,12 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import collections
+import concurrent.futures
 import itertools
 import pathlib
 import re
-from typing import Dict, FrozenSet, Iterable, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
 
 
 class VValve(object):
@@ -37,7 +39,6 @@ class VBoard(object):
   def SimulateTimeSteps(self, numberOfTimeSteps: int) -> None:
     for time in range(numberOfTimeSteps):
       self.SimulateTimeStep(numberOfTimeSteps - time - 1)
-      print(time, len(self.positionMap))
 
   def SimulateTimeStep(self, numberOfRemainingTimeSteps: int) -> None:
     newPositionMap: Dict[Tuple[Tuple[str, ...], FrozenSet[str]], int] = {}
@@ -78,20 +79,80 @@ class VBoard(object):
     return max(self.positionMap.values())
 
 
+class VCompressedBoard(object):
+  def __init__(self, valves: Dict[str, VValve], startValveName: str = "AA") -> None:
+    self.valveNames = [startValveName] + sorted(
+      valveName for valveName, valve in valves.items() if (valve.flowRate > 0) and (valveName != startValveName))
+    self.flowRates = [valves[valveName].flowRate for valveName in self.valveNames]
+    self.costs = [[distance + 1 for distance in distances]
+                  for distances in VCompressedBoard.ComputeDistances(valves, self.valveNames)]
+    self.numberOfValveIndexBits = len(self.valveNames).bit_length()
+    self.valveIndexMask = (1 << self.numberOfValveIndexBits) - 1
+    self.stateMap: Dict[int, int] = {}
+
+  @staticmethod
+  def ComputeDistances(valves: Dict[str, VValve], valveNames: Sequence[str]) -> List[List[int]]:
+    allDistances = []
+
+    for valveName in valveNames:
+      distances = {valveName: 0}
+      nextValveNames = collections.deque([valveName])
+
+      while len(nextValveNames) > 0:
+        currentValveName = nextValveNames.popleft()
+
+        for connectedValveName in valves[currentValveName].connectedValves:
+          if connectedValveName not in distances:
+            distances[connectedValveName] = distances[currentValveName] + 1
+            nextValveNames.append(connectedValveName)
+
+      allDistances.append([distances[otherValveName] for otherValveName in valveNames])
+
+    return allDistances
+
+  def SimulateTimeSteps(self, numberOfTimeSteps: int, firstValveIndices: Optional[Iterable[int]] = None) -> None:
+    allValveIndices = range(len(self.valveNames))
+    initialValveIndices = allValveIndices if firstValveIndices is None else list(firstValveIndices)
+    statesByRemainingTimeSteps: List[Dict[int, int]] = [{} for _ in range(numberOfTimeSteps + 1)]
+    statesByRemainingTimeSteps[numberOfTimeSteps][0] = 0
+    self.stateMap = {}
+
+    for numberOfRemainingTimeSteps in range(numberOfTimeSteps, -1, -1):
+      for state, pressure in statesByRemainingTimeSteps[numberOfRemainingTimeSteps].items():
+        if (state in self.stateMap) and (self.stateMap[state] >= pressure): continue
+        self.stateMap[state] = pressure
+        valveIndex = state & self.valveIndexMask
+        openValves = state >> self.numberOfValveIndexBits
+
+        for newValveIndex in (initialValveIndices if state == 0 else allValveIndices):
+          flowRate = self.flowRates[newValveIndex]
+          newNumberOfRemainingTimeSteps = numberOfRemainingTimeSteps - self.costs[valveIndex][newValveIndex]
+          if (flowRate == 0) or (openValves & (1 << newValveIndex)) or (newNumberOfRemainingTimeSteps <= 0): continue
+          newState = ((openValves | (1 << newValveIndex)) << self.numberOfValveIndexBits) | newValveIndex
+          newPressure = pressure + newNumberOfRemainingTimeSteps * flowRate
+          newStates = statesByRemainingTimeSteps[newNumberOfRemainingTimeSteps]
+          if newPressure > newStates.get(newState, -1): newStates[newState] = newPressure
+
+  def GetBestPressure(self) -> int:
+    return max(self.stateMap.values())
+
+  def GetBestPressuresByOpenValves(self) -> Dict[int, int]:
+    bestPressures: Dict[int, int] = {}
+
+    for state, pressure in self.stateMap.items():
+      openValves = state >> self.numberOfValveIndexBits
+      if pressure > bestPressures.get(openValves, -1): bestPressures[openValves] = pressure
+
+    return bestPressures
+
+
 def Main() -> None:
   input = pathlib.Path(__file__).with_name("input.txt").read_text()
   valves = ParseValves(input)
-  numbersOfAgents = [1, 2]
-  numbersOfTimeSteps = [30, 26]
-  bestPressures = []
-
-  for numberOfAgents, numberOfTimeSteps in zip(numbersOfAgents, numbersOfTimeSteps):
-    board = VBoard(valves, numberOfAgents)
-    board.SimulateTimeSteps(numberOfTimeSteps)
-    bestPressures.append(board.GetBestPressure())
-
-  print("Solution of part 1: {}".format(bestPressures[0]))
-  print("Solution of part 2: {}".format(bestPressures[1]))
+  board1 = VCompressedBoard(valves)
+  board1.SimulateTimeSteps(30)
+  print("Solution of part 1: {}".format(board1.GetBestPressure()))
+  print("Solution of part 2: {}".format(ComputeBestPressureForAgents(valves, 2, 26)))
 
 
 def ParseValves(string: str) -> Dict[str, VValve]:
@@ -104,4 +165,79 @@ def ParseValves(string: str) -> Dict[str, VValve]:
   return valves
 
 
+def ComputeBestPressureForAgents(valves: Dict[str, VValve],
+                                 numberOfAgents: int,
+                                 numberOfTimeSteps: int,
+                                 numberOfProcesses: Optional[int] = None) -> int:
+  board = VCompressedBoard(valves)
+  firstValveIndices = [valveIndex for valveIndex, flowRate in enumerate(board.flowRates) if flowRate > 0]
+  numberOfUnusedValveBits = 1 if board.flowRates[0] == 0 else 0
+  bestPressures: Dict[int, int] = {0: 0}
+
+  with concurrent.futures.ProcessPoolExecutor(numberOfProcesses) as executor:
+    for workerBestPressures in executor.map(ComputeBestPressuresByOpenValves, itertools.repeat(valves),
+                                            itertools.repeat(numberOfTimeSteps),
+                                            ([valveIndex] for valveIndex in firstValveIndices)):
+      for openValves, pressure in workerBestPressures.items():
+        openValves >>= numberOfUnusedValveBits
+        if pressure > bestPressures.get(openValves, -1): bestPressures[openValves] = pressure
+
+  allValves = (1 << (len(board.valveNames) - numberOfUnusedValveBits)) - 1
+  subsetBestPressures = ComputeSubsetBestPressures(bestPressures, allValves)
+  sortedBestPressures = sorted(((pressure, openValves) for openValves, pressure in bestPressures.items()), reverse=True)
+  return CombineBestPressures(sortedBestPressures, subsetBestPressures, numberOfAgents, allValves, {})
+
+
+def ComputeBestPressuresByOpenValves(valves: Dict[str, VValve], numberOfTimeSteps: int,
+                                     firstValveIndices: Iterable[int]) -> Dict[int, int]:
+  board = VCompressedBoard(valves)
+  board.SimulateTimeSteps(numberOfTimeSteps, firstValveIndices=firstValveIndices)
+  return board.GetBestPressuresByOpenValves()
+
+
+def ComputeSubsetBestPressures(bestPressures: Dict[int, int], allValves: int) -> List[int]:
+  subsetBestPressures = [0 for _ in range(allValves + 1)]
+
+  for openValves, pressure in bestPressures.items():
+    subsetBestPressures[openValves] = pressure
+
+  for bitIndex in range(allValves.bit_length()):
+    bit = 1 << bitIndex
+
+    for valveSubset in range(allValves + 1):
+      if (valveSubset & bit) and (subsetBestPressures[valveSubset ^ bit] > subsetBestPressures[valveSubset]):
+        subsetBestPressures[valveSubset] = subsetBestPressures[valveSubset ^ bit]
+
+  return subsetBestPressures
+
+
+def CombineBestPressures(sortedBestPressures: Sequence[Tuple[int, int]], subsetBestPressures: Sequence[int],
+                         numberOfAgents: int, availableValves: int, cache: Dict[Tuple[int, int], int]) -> int:
+  if numberOfAgents == 1: return subsetBestPressures[availableValves]
+  cacheKey = (numberOfAgents, availableValves)
+  if cacheKey in cache: return cache[cacheKey]
+  bestPressure = 0
+
+  if numberOfAgents == 2:
+    valveSubset = availableValves
+
+    while valveSubset > 0:
+      bestPressure = max(bestPressure,
+                         subsetBestPressures[valveSubset] + subsetBestPressures[availableValves & ~valveSubset])
+      valveSubset = (valveSubset - 1) & availableValves
+
+    cache[cacheKey] = bestPressure
+    return bestPressure
+
+  for pressure, openValves in sortedBestPressures:
+    if pressure + (numberOfAgents - 1) * min(pressure, subsetBestPressures[availableValves]) <= bestPressure: break
+    if openValves & ~availableValves: continue
+    bestPressure = max(
+      bestPressure, pressure + CombineBestPressures(sortedBestPressures, subsetBestPressures, numberOfAgents - 1,
+                                                    availableValves & ~openValves, cache))
+
+  cache[cacheKey] = bestPressure
+  return bestPressure
+
+
 if __name__ == "__main__": Main()
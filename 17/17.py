@@ -6,6 +6,7 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
+import copy
 import pathlib
 from typing import Dict, FrozenSet, Optional, Tuple
 
@@ -14,92 +15,175 @@ class VBoard(object):
   def __init__(self, jetPattern: str) -> None:
     self.jetSigns = [2 * int(character == ">") - 1 for character in jetPattern]
     self.jetIndex = 0
-    self.occupiedTiles: FrozenSet[Tuple[int, int]] = frozenset()
+    self.rows = bytearray()
+    self.numberOfPrunedRows = 0
+    self.lowestTouchedRow = 0
     self.rockIndex = 0
-    self.rocksTiles = [
+    self.width = 7
+    rocksTiles = [
       frozenset([(0, 0), (1, 0), (2, 0), (3, 0)]),
       frozenset([(1, 0), (0, 1), (1, 1), (2, 1), (1, 2)]),
       frozenset([(0, 0), (1, 0), (2, 0), (2, 1), (2, 2)]),
       frozenset([(0, 0), (0, 1), (0, 2), (0, 3)]),
       frozenset([(0, 0), (1, 0), (0, 1), (1, 1)]),
     ]
-    self.width = 7
+    self.rocksRowMasks = [
+      VBoard.ComputeShiftedRowMasks(VBoard.ConvertTilesToRowMasks(rockTiles), self.width) for rockTiles in rocksTiles
+    ]
 
   def __str__(self) -> str:
-    return "\n".join("".join("#" if (x, y) in self.occupiedTiles else "." for x in range(self.width))
-                     for y in range(self.GetHeightOfOccupiedTiles() - 1,
-                                    min([y for _, y in self.occupiedTiles] + [0]) - 1, -1))
-
-  def SimulateRocks(self,
-                    numberOfRocks: int,
-                    pruneHeight: Optional[int] = None,
-                    cacheHeight: Optional[int] = None) -> int:
-    rockNumber = 0
-    cache: Dict[Tuple[FrozenSet[Tuple[int, int]], int], Tuple[int, int]] = {}
-
-    while rockNumber < numberOfRocks:
-      self.SimulatePiece()
-      rockNumber += 1
-      if pruneHeight is not None: self.occupiedTiles = self.Prune(pruneHeight)
-
-      if (cacheHeight is not None) and (self.rockIndex == 0):
-        cacheKey = (self.Prune(cacheHeight, makeRelativeToTop=True), self.jetIndex)
-        heightOfOccupiedTiles = self.GetHeightOfOccupiedTiles()
-
-        if cacheKey in cache:
-          cachedRockNumber, cachedHeightOfOccupiedTiles = cache[cacheKey]
-          cycleLength = rockNumber - cachedRockNumber
-          numberOfCycles = (numberOfRocks - rockNumber) // cycleLength
-          rockNumber += numberOfCycles * cycleLength
-          yOffset = numberOfCycles * (heightOfOccupiedTiles - cachedHeightOfOccupiedTiles)
-          self.occupiedTiles = frozenset((x, y + yOffset) for x, y in self.occupiedTiles)
-          cacheHeight = None
-        else:
-          cache[cacheKey] = (rockNumber, heightOfOccupiedTiles)
+    return "\n".join("".join("#" if row & (1 << x) else "." for x in range(self.width)) for row in reversed(self.rows))
+
+  @staticmethod
+  def ConvertTilesToRowMasks(tiles: FrozenSet[Tuple[int, int]]) -> Tuple[int, ...]:
+    rowMasks = (max(y for _, y in tiles) + 1) * [0]
+    for x, y in tiles:
+      rowMasks[y] |= 1 << x
+    return tuple(rowMasks)
+
+  @staticmethod
+  def ComputeShiftedRowMasks(rowMasks: Tuple[int, ...], width: int) -> Dict[int, Tuple[int, ...]]:
+    rockWidth = max(rowMask.bit_length() for rowMask in rowMasks)
+    return {x: tuple(rowMask << x for rowMask in rowMasks) for x in range(width - rockWidth + 1)}
+
+  def SimulateRocks(self, numberOfRocks: int, pruneHeight: Optional[int] = None, detectCycle: bool = False) -> int:
+    if detectCycle:
+      cycleStart, cycleLength = self.FindCycle()
+
+      if numberOfRocks > cycleStart + cycleLength:
+        self.SimulateRocksWithoutUnreachableRows(cycleStart)
+        heightAtCycleStart = self.GetHeightOfOccupiedTiles()
+        self.SimulateRocksWithoutUnreachableRows(cycleLength)
+        numberOfCycles, numberOfRemainingRocks = divmod(numberOfRocks - cycleStart - cycleLength, cycleLength)
+        self.numberOfPrunedRows += numberOfCycles * (self.GetHeightOfOccupiedTiles() - heightAtCycleStart)
+        self.SimulateRocksWithoutUnreachableRows(numberOfRemainingRocks)
+      else:
+        self.SimulateRocksWithoutUnreachableRows(numberOfRocks)
+    else:
+      for _ in range(numberOfRocks):
+        self.SimulatePiece()
+        if (pruneHeight is not None) and (len(self.rows) > 2 * pruneHeight): self.Prune(pruneHeight)
 
     return self.GetHeightOfOccupiedTiles()
 
+  def SimulateRocksWithoutUnreachableRows(self, numberOfRocks: int) -> None:
+    for _ in range(numberOfRocks):
+      self.SimulatePiece()
+      self.PruneUnreachableRows()
+
+  def FindCycle(self) -> Tuple[int, int]:
+    depth = 8
+
+    while True:
+      cycleStart, cycleLength = self.FindCycleOfFingerprints(depth)
+      if self.IsCycleExact(cycleStart, cycleLength, depth): return cycleStart, cycleLength
+      depth *= 2
+
+  def FindCycleOfFingerprints(self, depth: int) -> Tuple[int, int]:
+    power = 1
+    cycleLength = 1
+    tortoise = self.Copy()
+    tortoise.PruneUnreachableRows()
+    hare = tortoise.Copy()
+    hare.SimulateRocksWithoutUnreachableRows(1)
+
+    while tortoise.GetFingerprint(depth) != hare.GetFingerprint(depth):
+      if power == cycleLength:
+        tortoise = hare.Copy()
+        power *= 2
+        cycleLength = 0
+
+      hare.SimulateRocksWithoutUnreachableRows(1)
+      cycleLength += 1
+
+    cycleStart = 0
+    tortoise = self.Copy()
+    tortoise.PruneUnreachableRows()
+    hare = tortoise.Copy()
+    hare.SimulateRocksWithoutUnreachableRows(cycleLength)
+
+    while tortoise.GetFingerprint(depth) != hare.GetFingerprint(depth):
+      tortoise.SimulateRocksWithoutUnreachableRows(1)
+      hare.SimulateRocksWithoutUnreachableRows(1)
+      cycleStart += 1
+
+    return cycleStart, cycleLength
+
+  def IsCycleExact(self, cycleStart: int, cycleLength: int, depth: int) -> bool:
+    board = self.Copy()
+    board.PruneUnreachableRows()
+    board.SimulateRocksWithoutUnreachableRows(cycleStart)
+    heightAtCycleStart = board.GetHeightOfOccupiedTiles()
+    board.lowestTouchedRow = heightAtCycleStart
+    board.SimulateRocksWithoutUnreachableRows(cycleLength)
+    return board.lowestTouchedRow >= heightAtCycleStart - depth
+
   def SimulatePiece(self) -> None:
-    rockTiles = self.rocksTiles[self.rockIndex]
-    self.rockIndex = (self.rockIndex + 1) % len(self.rocksTiles)
-    rockOffset = (2, self.GetHeightOfOccupiedTiles() + 3)
+    shiftedRowMasks = self.rocksRowMasks[self.rockIndex]
+    self.rockIndex = (self.rockIndex + 1) % len(self.rocksRowMasks)
+    x = 2
+    y = len(self.rows) + 3
 
     while True:
       jetSign = self.jetSigns[self.jetIndex]
       self.jetIndex = (self.jetIndex + 1) % len(self.jetSigns)
-      newRockOffset = (rockOffset[0] + jetSign, rockOffset[1])
-      if not self.DoesRockCollide(rockTiles, newRockOffset): rockOffset = newRockOffset
+      newX = x + jetSign
+      if (newX in shiftedRowMasks) and (not self.DoesRockCollide(shiftedRowMasks[newX], y)): x = newX
+      rowMasks = shiftedRowMasks[x]
+      if (y == 0) or self.DoesRockCollide(rowMasks, y - 1): break
+      y -= 1
 
-      newRockOffset = (rockOffset[0], rockOffset[1] - 1)
+    self.lowestTouchedRow = min(self.lowestTouchedRow, self.numberOfPrunedRows + y - 1)
 
-      if self.DoesRockCollide(rockTiles, newRockOffset):
-        break
+    for rowIndex, rowMask in enumerate(rowMasks, y):
+      if rowIndex < len(self.rows):
+        self.rows[rowIndex] |= rowMask
       else:
-        rockOffset = newRockOffset
+        self.rows.append(rowMask)
 
-    self.occupiedTiles |= frozenset((x + rockOffset[0], y + rockOffset[1]) for x, y in rockTiles)
+  def GetHeightOfOccupiedTiles(self) -> int:
+    return self.numberOfPrunedRows + len(self.rows)
 
-  @staticmethod
-  def GetHeightOfTiles(tiles: FrozenSet[Tuple[int, int]]) -> int:
-    return max([y for _, y in tiles] + [-1]) + 1
+  def DoesRockCollide(self, rowMasks: Tuple[int, ...], y: int) -> bool:
+    for rowIndex, rowMask in enumerate(rowMasks, y):
+      if rowIndex >= len(self.rows): return False
+      if self.rows[rowIndex] & rowMask: return True
 
-  def GetHeightOfOccupiedTiles(self) -> int:
-    return VBoard.GetHeightOfTiles(self.occupiedTiles)
+    return False
 
-  def DoesRockCollide(self, rockTiles: FrozenSet[Tuple[int, int]], offset: Tuple[int, int]) -> bool:
-    for x, y in rockTiles:
-      actualX = x + offset[0]
-      actualY = y + offset[1]
+  def PruneUnreachableRows(self) -> None:
+    fullRowMask = (1 << self.width) - 1
+    reachableRowMask = fullRowMask
+    rowIndex = len(self.rows)
 
-      if (actualX < 0) or (actualX >= self.width) or (actualY < 0) or ((actualX, actualY) in self.occupiedTiles):
-        return True
+    while rowIndex > 0:
+      emptyRowMask = fullRowMask & ~self.rows[rowIndex - 1]
+      newReachableRowMask = reachableRowMask & emptyRowMask
+      if newReachableRowMask == 0: break
+      reachableRowMask = 0
 
-    return False
+      while newReachableRowMask != reachableRowMask:
+        reachableRowMask = newReachableRowMask
+        newReachableRowMask = (reachableRowMask | (reachableRowMask << 1) | (reachableRowMask >> 1)) & emptyRowMask
+
+      rowIndex -= 1
+      self.rows[rowIndex] = fullRowMask & ~reachableRowMask
+
+    del self.rows[:rowIndex]
+    self.numberOfPrunedRows += rowIndex
+
+  def GetFingerprint(self, depth: int) -> Tuple[bytes, int, int]:
+    return (bytes(self.rows[-depth:]), self.jetIndex, self.rockIndex)
+
+  def Copy(self) -> "VBoard":
+    board = copy.copy(self)
+    board.rows = bytearray(self.rows)
+    return board
 
-  def Prune(self, height: int, makeRelativeToTop: bool = False) -> FrozenSet[Tuple[int, int]]:
-    heightOfOccupiedTiles = self.GetHeightOfOccupiedTiles()
-    return frozenset((x, y - (heightOfOccupiedTiles if makeRelativeToTop else 0)) for x, y in self.occupiedTiles
-                     if y >= heightOfOccupiedTiles - height)
+  def Prune(self, height: int) -> None:
+    numberOfRowsToPrune = max(len(self.rows) - height, 0)
+    del self.rows[:numberOfRowsToPrune]
+    self.numberOfPrunedRows += numberOfRowsToPrune
 
 
 def Main() -> None:
@@ -108,7 +192,7 @@ def Main() -> None:
   board1 = VBoard(jetPattern)
   board1.SimulateRocks(2022)
   board2 = VBoard(jetPattern)
-  board2.SimulateRocks(1000000000000, pruneHeight=100, cacheHeight=10)
+  board2.SimulateRocks(1000000000000, detectCycle=True)
   print("Solution of part 1: {}".format(board1.GetHeightOfOccupiedTiles()))
   print("Solution of part 2: {}".format(board2.GetHeightOfOccupiedTiles()))
 
@@ -6,88 +6,339 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 
-import itertools
 import pathlib
-from typing import Dict, List, Sequence, Set, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
+import numpy as np
+import numpy.typing as npt
 
-def Main() -> None:
-  input = pathlib.Path(__file__).with_name("input.txt").read_text()
-  cubes = ParseCubes(input)
-  allAdjacentCubeIndices = ComputeAllAdjacentCubeIndices(cubes)
-  interiorCubes = ComputeInteriorCubes(cubes)
-  cubesWithoutHoles = cubes + list(interiorCubes)
-  allAdjacentCubeIndicesWithoutHoles = ComputeAllAdjacentCubeIndices(cubesWithoutHoles)
-  print("Solution of part 1: {}".format(ComputeSurfaceArea(allAdjacentCubeIndices)))
-  print("Solution of part 2: {}".format(ComputeSurfaceArea(allAdjacentCubeIndicesWithoutHoles)))
 
+gPoint = Tuple[int, int, int]
 
-def ParseCubes(string: str) -> List[Tuple[int, int, int]]:
-  linesParts = [line.split(",") for line in string.splitlines()]
-  return [(int(lineParts[0]), int(lineParts[1]), int(lineParts[2])) for lineParts in linesParts]
+gAir = 0
+gLava = 1
+gExterior = 2
+gBorder = 3
 
+gMaximumDenseVolumePerCube = 64
 
-def ComputeAllAdjacentCubeIndices(cubes: Sequence[Tuple[int, int, int]]) -> List[Set[int]]:
-  allAdjacentCubes: Dict[Tuple[int, int, int], Set[int]] = {cube: set() for cube in cubes}
+gChunkSize = 8
+gChunkStrides = (gChunkSize * gChunkSize, gChunkSize, 1)
+gChunkVolume = gChunkSize ** 3
+gFullChunk = (1 << gChunkVolume) - 1
+gLowerLayerMasks = [
+  sum(1 << index for index in range(gChunkVolume) if (index // stride) % gChunkSize == 0) for stride in gChunkStrides
+]
+gUpperLayerMasks = [
+  sum(1 << index for index in range(gChunkVolume) if (index // stride) % gChunkSize == gChunkSize - 1)
+  for stride in gChunkStrides
+]
 
-  for cubeIndex, cube in enumerate(cubes):
-    for candidateAdjacentCube in GetAdjacentCubes(cube):
-      if candidateAdjacentCube in allAdjacentCubes:
-        allAdjacentCubes[candidateAdjacentCube].add(cubeIndex)
 
-  return [allAdjacentCubes[cube] for cube in cubes]
+class VDroplet(object):
+  def __init__(self, cubes: Sequence[gPoint]) -> None:
+    cubesArray = np.array(cubes, dtype=np.int64).reshape(-1, 3)
+    self.offset = cubesArray.min(axis=0) - 2
+    self.voxels = np.zeros(tuple(cubesArray.max(axis=0) - self.offset + 3), dtype=np.uint8)
+    self.voxels[tuple((cubesArray - self.offset).T)] = gLava
 
+  @staticmethod
+  def CountFaces(states: npt.NDArray[np.uint8], state: int, otherState: Optional[int]) -> int:
+    numberOfFaces = 0
+    previousIsState: Optional[npt.NDArray[np.bool_]] = None
+    previousIsOther: Optional[npt.NDArray[np.bool_]] = None
 
-def GetAdjacentCubes(cube: Tuple[int, int, int]) -> Set[Tuple[int, int, int]]:
-  return {
-    (cube[0] - 1, cube[1], cube[2]),
-    (cube[0] + 1, cube[1], cube[2]),
-    (cube[0], cube[1] - 1, cube[2]),
-    (cube[0], cube[1] + 1, cube[2]),
-    (cube[0], cube[1], cube[2] - 1),
-    (cube[0], cube[1], cube[2] + 1),
-  }
+    for plane in states:
+      isState = plane == state
+      isOther = (plane != state) if otherState is None else (plane == otherState)
+      numberOfFaces += int(np.count_nonzero(isState[1:, :] & isOther[:-1, :]))
+      numberOfFaces += int(np.count_nonzero(isState[:-1, :] & isOther[1:, :]))
+      numberOfFaces += int(np.count_nonzero(isState[:, 1:] & isOther[:, :-1]))
+      numberOfFaces += int(np.count_nonzero(isState[:, :-1] & isOther[:, 1:]))
 
+      if (previousIsState is not None) and (previousIsOther is not None):
+        numberOfFaces += int(np.count_nonzero(isState & previousIsOther))
+        numberOfFaces += int(np.count_nonzero(previousIsState & isOther))
 
-def ComputeSurfaceArea(allAdjacentCubes: Sequence[Set[int]]) -> int:
-  return 6 * len(allAdjacentCubes) - sum(len(adjacentCubes) for adjacentCubes in allAdjacentCubes)
+      previousIsState, previousIsOther = isState, isOther
 
+    return numberOfFaces
 
-def ComputeInteriorCubes(cubes: Sequence[Tuple[int, int, int]]) -> Set[Tuple[int, int, int]]:
-  lowerBoundCube = (
-    min(cube[0] for cube in cubes) - 1,
-    min(cube[1] for cube in cubes) - 1,
-    min(cube[2] for cube in cubes) - 1,
-  )
-  upperBoundCube = (
-    max(cube[0] for cube in cubes) + 1,
-    max(cube[1] for cube in cubes) + 1,
-    max(cube[2] for cube in cubes) + 1,
+  def ComputeSurfaceArea(self) -> int:
+    return VDroplet.CountFaces(self.voxels, gLava, None)
+
+  def MarkExteriorVoxels(self) -> None:
+    states = self.voxels
+    states[[0, -1], :, :] = gBorder
+    states[:, [0, -1], :] = gBorder
+    states[:, :, [0, -1]] = gBorder
+    VDroplet.MarkVisibleAir(states)
+    flatStates = states.reshape(-1)
+    strides = (states.shape[1] * states.shape[2], states.shape[2], 1)
+    neighborOffsets = np.array([sign * stride for stride in strides for sign in (-1, 1)], dtype=np.int64)
+    frontier = VDroplet.FindExteriorVoxelsNextToAir(states)
+
+    while frontier.size > 0:
+      neighbors = (frontier[:, np.newaxis] + neighborOffsets).reshape(-1)
+      neighbors = np.sort(neighbors[flatStates[neighbors] == gAir])
+      isNewNeighbor = np.ones(neighbors.size, dtype=np.bool_)
+      isNewNeighbor[1:] = neighbors[1:] != neighbors[:-1]
+      frontier = neighbors[isNewNeighbor]
+      flatStates[frontier] = gExterior
+
+  def ResetExteriorVoxels(self) -> None:
+    for plane in self.voxels:
+      plane[plane != gLava] = gAir
+
+  @staticmethod
+  def MarkVisibleAir(states: npt.NDArray[np.uint8]) -> None:
+    isVisible = np.empty(states.shape[1:], dtype=np.bool_)
+
+    for planeIndices in (range(states.shape[0]), range(states.shape[0] - 1, -1, -1)):
+      isVisible.fill(True)
+
+      for planeIndex in planeIndices:
+        plane = states[planeIndex]
+        np.logical_and(isVisible, plane != gLava, out=isVisible)
+        plane[isVisible & (plane == gAir)] = gExterior
+
+    for plane in states:
+      isNotLava = plane != gLava
+
+      for axis in range(2):
+        np.logical_and.accumulate(isNotLava, axis=axis, out=isVisible)
+        plane[isVisible & (plane == gAir)] = gExterior
+        np.logical_and.accumulate(np.flip(isNotLava, axis=axis), axis=axis, out=np.flip(isVisible, axis=axis))
+        plane[isVisible & (plane == gAir)] = gExterior
+
+  @staticmethod
+  def FindExteriorVoxelsNextToAir(states: npt.NDArray[np.uint8]) -> npt.NDArray[np.int64]:
+    planeSize = states.shape[1] * states.shape[2]
+    hasAirNeighbor = np.empty(states.shape[1:], dtype=np.bool_)
+    frontiers = [np.empty(0, dtype=np.int64)]
+
+    for planeIndex in range(1, states.shape[0] - 1):
+      isAir = states[planeIndex] == gAir
+      np.logical_or(states[planeIndex - 1] == gAir, states[planeIndex + 1] == gAir, out=hasAirNeighbor)
+      hasAirNeighbor[1:, :] |= isAir[:-1, :]
+      hasAirNeighbor[:-1, :] |= isAir[1:, :]
+      hasAirNeighbor[:, 1:] |= isAir[:, :-1]
+      hasAirNeighbor[:, :-1] |= isAir[:, 1:]
+      hasAirNeighbor &= states[planeIndex] == gExterior
+      frontiers.append(np.flatnonzero(hasAirNeighbor) + planeIndex * planeSize)
+
+    return np.concatenate(frontiers)
+
+  def ComputeExteriorSurfaceArea(self) -> int:
+    try:
+      self.MarkExteriorVoxels()
+      return VDroplet.CountFaces(self.voxels, gLava, gExterior)
+    finally:
+      self.ResetExteriorVoxels()
+
+
+class VSparseDroplet(object):
+  def __init__(self, cubes: Iterable[gPoint]) -> None:
+    self.chunks = ConvertPointsToChunks(cubes)
+
+  def ComputeSurfaceArea(self) -> int:
+    return self.CountExposedFaces({chunk: gFullChunk & ~bits for chunk, bits in self.chunks.items()}, None)
+
+  def ComputeExteriorSurfaceArea(self) -> int:
+    componentLabels, haloLabels, exteriorLabel = ComputeAirComponents(self.chunks)
+    exteriorAirMasks = {
+      chunk: sum(mask for mask, label in chunkComponentLabels if label == exteriorLabel)
+      for chunk, chunkComponentLabels in componentLabels.items()
+    }
+    exteriorHalos = {halo for halo, label in haloLabels.items() if label == exteriorLabel}
+    return self.CountExposedFaces(exteriorAirMasks, exteriorHalos)
+
+  def CountExposedFaces(self, exposedAirMasks: Dict[gPoint, int], exposedHalos: Optional[Set[gPoint]]) -> int:
+    numberOfFaces = 0
+
+    for chunk, bits in self.chunks.items():
+      for axis in range(3):
+        for direction in (-1, 1):
+          numberOfFaces += (ShiftChunk(bits, axis, direction) & exposedAirMasks[chunk]).bit_count()
+          neighbor = GetNeighborPoint(chunk, axis, direction)
+          boundaryBits = bits & (gUpperLayerMasks if direction > 0 else gLowerLayerMasks)[axis]
+
+          if neighbor in self.chunks:
+            numberOfFaces += (MoveLayerToNeighbor(boundaryBits, axis, direction)
+                              & exposedAirMasks[neighbor]).bit_count()
+          elif (exposedHalos is None) or (neighbor in exposedHalos):
+            numberOfFaces += boundaryBits.bit_count()
+
+    return numberOfFaces
+
+
+def ConvertPointsToChunks(points: Iterable[gPoint]) -> Dict[gPoint, int]:
+  chunks: Dict[gPoint, int] = {}
+
+  for point in points:
+    chunk, index = SplitPoint(point)
+    chunks[chunk] = chunks.get(chunk, 0) | (1 << index)
+
+  return chunks
+
+
+def SplitPoint(point: gPoint) -> Tuple[gPoint, int]:
+  chunk = (point[0] // gChunkSize, point[1] // gChunkSize, point[2] // gChunkSize)
+  index = sum((coordinate % gChunkSize) * stride for coordinate, stride in zip(point, gChunkStrides))
+  return chunk, index
+
+
+def GetNeighborPoint(point: gPoint, axis: int, direction: int) -> gPoint:
+  return (
+    point[0] + (direction if axis == 0 else 0),
+    point[1] + (direction if axis == 1 else 0),
+    point[2] + (direction if axis == 2 else 0),
   )
-  cubesSet = set(cubes)
-  exteriorCubes = set()
-  surfaceCubes = set()
-  reaminingExteriorCubes = {lowerBoundCube}
-
-  while len(reaminingExteriorCubes) > 0:
-    cube = reaminingExteriorCubes.pop()
-
-    if cube in cubesSet:
-      surfaceCubes.add(cube)
-      continue
-
-    if ((cube in exteriorCubes) or (not ((lowerBoundCube[0] <= cube[0] <= upperBoundCube[0]) and
-                                         (lowerBoundCube[1] <= cube[1] <= upperBoundCube[1]) and
-                                         (lowerBoundCube[2] <= cube[2] <= upperBoundCube[2])))):
-      continue
-
-    exteriorCubes.add(cube)
-    reaminingExteriorCubes.update(GetAdjacentCubes(cube))
-
-  allCubes = set(
-    itertools.product(range(lowerBoundCube[0], upperBoundCube[0] + 1), range(lowerBoundCube[1], upperBoundCube[1] + 1),
-                      range(lowerBoundCube[2], upperBoundCube[2] + 1)))
-  return allCubes - exteriorCubes - surfaceCubes - cubesSet
+
+
+def SubtractPoints(point1: gPoint, point2: gPoint) -> gPoint:
+  return (point1[0] - point2[0], point1[1] - point2[1], point1[2] - point2[2])
+
+
+def ShiftChunk(bits: int, axis: int, direction: int) -> int:
+  if direction > 0:
+    return (bits & ~gUpperLayerMasks[axis]) << gChunkStrides[axis]
+  else:
+    return (bits & ~gLowerLayerMasks[axis]) >> gChunkStrides[axis]
+
+
+def MoveLayerToNeighbor(bits: int, axis: int, direction: int) -> int:
+  if direction > 0:
+    return (bits & gUpperLayerMasks[axis]) >> ((gChunkSize - 1) * gChunkStrides[axis])
+  else:
+    return (bits & gLowerLayerMasks[axis]) << ((gChunkSize - 1) * gChunkStrides[axis])
+
+
+def SplitChunkIntoComponents(bits: int) -> List[int]:
+  if bits.bit_count() >= gChunkVolume - 2: return [bits]
+  components = []
+  remainingBits = bits
+
+  while remainingBits != 0:
+    component = remainingBits & -remainingBits
+
+    while True:
+      grownComponent = component
+
+      for axis in range(3):
+        grownComponent |= ShiftChunk(component, axis, -1) | ShiftChunk(component, axis, 1)
+
+      grownComponent &= bits
+      if grownComponent == component: break
+      component = grownComponent
+
+    components.append(component)
+    remainingBits &= ~component
+
+  return components
+
+
+def ComputeAirComponents(
+    chunks: Dict[gPoint, int]) -> Tuple[Dict[gPoint, List[Tuple[int, int]]], Dict[gPoint, int], int]:
+  parents = [0]
+  componentNodes: Dict[gPoint, List[Tuple[int, int]]] = {}
+
+  for chunk, bits in chunks.items():
+    componentNodes[chunk] = []
+
+    for component in SplitChunkIntoComponents(gFullChunk & ~bits):
+      componentNodes[chunk].append((component, len(parents)))
+      parents.append(len(parents))
+
+  haloNodes: Dict[gPoint, int] = {}
+
+  for chunk in chunks:
+    for axis in range(3):
+      for direction in (-1, 1):
+        neighbor = GetNeighborPoint(chunk, axis, direction)
+
+        if (neighbor not in chunks) and (neighbor not in haloNodes):
+          haloNodes[neighbor] = len(parents)
+          parents.append(len(parents))
+
+  coarseLabels, coarseExteriorLabel = LabelAirPoints(set(chunks), haloNodes)
+  coarseLabelNodes = {coarseExteriorLabel: 0}
+
+  for halo, haloNode in haloNodes.items():
+    UniteNodes(parents, haloNode, coarseLabelNodes.setdefault(coarseLabels[halo], haloNode))
+
+  for chunk in chunks:
+    for axis in range(3):
+      for direction in (-1, 1):
+        neighbor = GetNeighborPoint(chunk, axis, direction)
+
+        for component, node in componentNodes[chunk]:
+          movedComponent = MoveLayerToNeighbor(component, axis, direction)
+          if movedComponent == 0: continue
+
+          if neighbor in haloNodes:
+            UniteNodes(parents, node, haloNodes[neighbor])
+          elif direction > 0:
+            for neighborComponent, neighborNode in componentNodes[neighbor]:
+              if movedComponent & neighborComponent != 0: UniteNodes(parents, node, neighborNode)
+
+  componentLabels = {
+    chunk: [(component, FindRoot(parents, node)) for component, node in chunkComponentNodes]
+    for chunk, chunkComponentNodes in componentNodes.items()
+  }
+  haloLabels = {halo: FindRoot(parents, haloNode) for halo, haloNode in haloNodes.items()}
+  return componentLabels, haloLabels, FindRoot(parents, 0)
+
+
+def LabelAirPoints(points: Set[gPoint], airPoints: Iterable[gPoint]) -> Tuple[Dict[gPoint, int], int]:
+  if len(points) <= 1: return {airPoint: 0 for airPoint in airPoints}, 0
+  origin = (min(point[0] for point in points), min(point[1] for point in points), min(point[2] for point in points))
+  componentLabels, haloLabels, exteriorLabel = ComputeAirComponents(
+    ConvertPointsToChunks(SubtractPoints(point, origin) for point in points))
+  labels = {}
+
+  for airPoint in airPoints:
+    chunk, index = SplitPoint(SubtractPoints(airPoint, origin))
+
+    if chunk in haloLabels:
+      labels[airPoint] = haloLabels[chunk]
+    else:
+      labels[airPoint] = next(label for component, label in componentLabels[chunk] if (component >> index) & 1)
+
+  return labels, exteriorLabel
+
+
+def FindRoot(parents: List[int], node: int) -> int:
+  while parents[node] != node:
+    parents[node] = parents[parents[node]]
+    node = parents[node]
+
+  return node
+
+
+def UniteNodes(parents: List[int], node1: int, node2: int) -> None:
+  parents[FindRoot(parents, node1)] = FindRoot(parents, node2)
+
+
+def CreateDroplet(cubes: Sequence[gPoint]) -> Union[VDroplet, VSparseDroplet]:
+  boundingBoxVolume = 1
+
+  for axis in range(3):
+    boundingBoxVolume *= max(cube[axis] for cube in cubes) - min(cube[axis] for cube in cubes) + 1
+
+  return VDroplet(cubes) if boundingBoxVolume <= gMaximumDenseVolumePerCube * len(cubes) else VSparseDroplet(cubes)
+
+
+def Main() -> None:
+  input = pathlib.Path(__file__).with_name("input.txt").read_text()
+  droplet = CreateDroplet(ParseCubes(input))
+  print("Solution of part 1: {}".format(droplet.ComputeSurfaceArea()))
+  print("Solution of part 2: {}".format(droplet.ComputeExteriorSurfaceArea()))
+
+
+def ParseCubes(string: str) -> List[gPoint]:
+  linesParts = [line.split(",") for line in string.splitlines()]
+  return [(int(lineParts[0]), int(lineParts[1]), int(lineParts[2])) for lineParts in linesParts]
 
 
 if __name__ == "__main__": Main()